@@ -1,22 +1,22 @@
 import streamlit as st
 from io import BytesIO
 from datetime import datetime
-import pandas as pd
 
 # --- Local Imports from our other files ---
-from style import STYLE_PRESETS
+# Only lightweight modules are imported here. pandas, numpy, requests and python-pptx
+# are imported inside the step that first needs them, so Step 0 starts fast.
+import feedback
+from jobs import get_job_runner
 from ui import render_sidebar
-# Updated import to include get_ai_metric_categories
-from data_processing import process_scorecard_data, calculate_all_benchmarks, get_ai_metric_categories
-from powerpoint import create_presentation
-from excel import create_excel_workbook
-# New import for the strategy logic
-from strategy import generate_strategy
+# Categorization goes through a per-session service that memoizes AI results
+from categorization import get_session_categorizer
 
 # ================================================================================
 # 1) App State Initialization
 # ================================================================================
 st.set_page_config(page_title="Event Marketing Scorecard", layout="wide")
+# Pipeline modules report through feedback; show their messages in the app
+feedback.set_notifier(feedback.StreamlitNotifier())
 
 # Version updated to reflect the new feature
 APP_VERSION = "4.2.1" # Version updated for form fix
@@ -41,15 +41,115 @@ if 'app_version' not in st.session_state or st.session_state.app_version != APP_
     st.session_state.ai_categories = {}
     st.session_state.strategy_profile = {}
     st.session_state.benchmark_choice = "No, I will enter benchmarks manually later."
-    st.session_state.benchmark_df = pd.DataFrame()
+    st.session_state.benchmark_df = None
     st.session_state.sheets_dict = None
     st.session_state.presentation_buffer = None
+    st.session_state.presentation_filename = "game_scorecard_presentation.pptx"
+    st.session_state.presentation_job_id = None
+    st.session_state.presentation_messages = []
     st.session_state.proposed_benchmarks = {}
     st.session_state.avg_actuals = {}
     st.session_state.saved_moments = {}
     # --- NEW STATE VARIABLES FOR STRATEGY ---
-    if 'influencers' not in st.session_state:
-        st.session_state.influencers = []
+    # Typed influencer roster (see strategy.to_influencer_frame), created when Step 2 first runs
+    if 'influencer_df' not in st.session_state:
+        st.session_state.influencer_df = None
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def load_historical_upload(content_hash, _file_bytes, filename):
+    """Parses an uploaded historical file once per content hash (the bytes themselves are not hashed again)."""
+    from importers import parse_historical_upload
+    return parse_historical_upload(_file_bytes, filename)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_influencer_roster(content_hash, _file_bytes, filename):
+    """Parses an uploaded influencer roster once per content hash."""
+    from importers import parse_influencer_roster
+    return parse_influencer_roster(_file_bytes, filename)
+
+
+def build_presentation_download(title, subtitle, moments, sheets_dict, style_guide, regions, api_key, build_cache):
+    """
+    Builds the deck (or one deck per region, zipped) and returns (buffer, file_name).
+    Runs as a background job, so it must not touch st.session_state.
+    """
+    from powerpoint import create_presentation, create_region_presentations
+    if len(regions) == 1:
+        ppt_buffer = create_presentation(title=title, subtitle=subtitle, scorecard_moments=moments, sheets_dict=sheets_dict, style_guide=style_guide,
+                                         region_prompt=regions[0], openai_api_key=api_key, build_cache=build_cache)
+        return ppt_buffer, "game_scorecard_presentation.pptx"
+
+    # One pass for all regions: shared slides are rendered once, images per region run concurrently
+    import re
+    import zipfile
+    decks = create_region_presentations(title=title, subtitle=subtitle, scorecard_moments=moments, sheets_dict=sheets_dict, style_guide=style_guide,
+                                        regions=regions, openai_api_key=api_key, build_cache=build_cache)
+    zip_buffer = BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as archive:
+        for region, deck in decks.items():
+            archive.writestr(f"game_scorecard_{re.sub(r'[^A-Za-z0-9_-]+', '_', region)}.pptx", deck.getvalue())
+    zip_buffer.seek(0)
+    return zip_buffer, "game_scorecard_presentations.zip"
+
+
+@st.fragment(run_every=1.0)
+def render_presentation_job():
+    """
+    Polls this session's presentation job; only this fragment reruns while the deck builds.
+    Call it only while presentation_job_id is set: a fragment that is not rendered does not poll.
+    """
+    job_id = st.session_state.get("presentation_job_id")
+    if not job_id:
+        return
+    runner = get_job_runner()
+    job = runner.get(job_id)
+    if job is None:
+        st.session_state.presentation_job_id = None
+        return
+    if not job.finished:
+        st.progress(job.progress, text=job.progress_text or f"{job.name}... You can keep editing moments meanwhile.")
+        return
+    st.session_state.presentation_job_id = None
+    st.session_state.presentation_messages = list(dict.fromkeys(m for m in job.messages if m[0] != "info"))
+    if job.error is None:
+        st.session_state.presentation_buffer, st.session_state.presentation_filename = job.result
+    else:
+        st.session_state.presentation_messages.append(("error", f"Building the presentation failed: {job.error}"))
+    runner.discard(job_id)
+    st.rerun(scope="app")
+
+
+def render_strategy_profile(profile):
+    """Shows the Step 2 results (outputs, influencer tiers, priorities, considerations); rendered in Step 3."""
+    import pandas as pd
+    from strategy import format_calculated_outputs
+
+    if profile.get("calculated_outputs"):
+        st.markdown("#### Calculated Profile Outputs")
+        df_outputs = pd.DataFrame([format_calculated_outputs(profile["calculated_outputs"])])
+        st.dataframe(df_outputs, use_container_width=True, hide_index=True)
+
+    influencers = profile.get("influencer_model")
+    if influencers and influencers["influencer_count"]:
+        st.markdown("#### Influencer Tiers")
+        st.dataframe(influencers["tiers"], use_container_width=True,
+                     column_config={"reach": st.column_config.NumberColumn(format="localized"),
+                                    "engaged_audience": st.column_config.NumberColumn(format="localized"),
+                                    "median_engagement_rate": st.column_config.NumberColumn(format="%.2f%%"),
+                                    "share_of_reach": st.column_config.NumberColumn(format="percent")})
+        st.caption("Engagement rate percentiles: " + ", ".join(f"{q} {v:.2f}%" for q, v in influencers["engagement_percentiles"].items()))
+
+    if profile.get("prioritized_metrics"):
+        st.markdown("#### Metric Prioritization")
+        st.dataframe(pd.DataFrame(profile["prioritized_metrics"]), use_container_width=True)
+
+    if profile.get("strategic_considerations"):
+        st.markdown("#### Strategic Considerations")
+        for item in profile["strategic_considerations"]:
+            if item['type'] == 'Warning': st.warning(item['text'])
+            else: st.info(item['text'])
 
 
 st.title("Event Marketing Scorecard & Presentation Generator")
@@ -124,10 +224,8 @@ elif not st.session_state.metrics_confirmed:
         else:
             st.session_state.metrics = st.session_state.current_metrics
             with st.spinner("Using AI to categorize your metrics..."):
-                st.session_state.ai_categories = get_ai_metric_categories(
-                    st.session_state.metrics,
-                    st.session_state.openai_api_key
-                )
+                categorizer = get_session_categorizer(st.session_state.openai_api_key)
+                st.session_state.ai_categories = categorizer.categorize(st.session_state.metrics)
             st.session_state.metrics_confirmed = True
             del st.session_state.current_metrics
             st.rerun()
@@ -136,28 +234,51 @@ elif not st.session_state.metrics_confirmed:
 # MODIFIED Step 2: Campaign & Investment Profile
 # ================================================================================
 elif not st.session_state.strategy_complete:
+    import pandas as pd
+    from strategy import generate_strategy, to_influencer_frame
+    from importers import SUPPORTED_UPLOAD_TYPES, file_hash
+
     st.header("Step 2: Campaign & Investment Profile")
     st.info("Provide details about your campaign's strategy and investments to generate a detailed profile and inform your benchmarks.")
 
+    # Metrics left Uncategorized by a failed AI call in Step 1 can be retried here (and are retried again in Step 4)
+    categorizer = get_session_categorizer(st.session_state.openai_api_key)
+    categorizer.seed(st.session_state.ai_categories or {})
+    uncategorized = categorizer.missing(st.session_state.metrics)
+    if uncategorized:
+        col1, col2 = st.columns([3, 1])
+        col1.warning(f"{len(uncategorized)} metric(s) could not be categorized: {', '.join(uncategorized)}.")
+        if col2.button("🔁 Retry categorization", use_container_width=True):
+            with st.spinner("Using AI to categorize your metrics..."):
+                st.session_state.ai_categories = categorizer.categorize(st.session_state.metrics)
+            st.rerun()
+
     # --- Part B: Influencer Management (MOVED OUTSIDE THE FORM) ---
+    # One upload plus one grid instead of a widget row per influencer, so reruns stay cheap for large rosters
+    if st.session_state.influencer_df is None:
+        st.session_state.influencer_df = to_influencer_frame([])
     with st.expander("Part B: Influencer Investment & Reach"):
-        st.write("Add or remove influencers for the campaign. The data is saved as you type.")
-        # Display input fields for each influencer in the list
-        for i, influencer in enumerate(st.session_state.influencers):
-            st.markdown(f"--- \n ##### Influencer {i+1}")
-            cols = st.columns([2,1,1,1])
-            st.session_state.influencers[i]['name'] = cols[0].text_input("Name/Handle", value=influencer.get('name',''), key=f"inf_name_{i}")
-            st.session_state.influencers[i]['follower_count'] = cols[1].number_input("Followers", min_value=0, value=influencer.get('follower_count',0), key=f"inf_followers_{i}")
-            st.session_state.influencers[i]['engagement_rate'] = cols[2].number_input("Engagement %", min_value=0.0, max_value=100.0, value=influencer.get('engagement_rate',0.0), format="%.2f", key=f"inf_eng_{i}")
-            # The remove button is a regular button and works fine here
-            if cols[3].button(f"Remove", key=f"inf_remove_{i}"):
-                st.session_state.influencers.pop(i)
-                st.rerun()
-
-    # The "Add Influencer" button is now outside the form
-    if st.button("Add Influencer"):
-        st.session_state.influencers.append({})
-        st.rerun()
+        st.write("Upload a roster (CSV or Excel with name, followers and engagement % columns) or edit the table directly; add or delete rows in the grid.")
+        roster_file = st.file_uploader("Influencer roster", type=SUPPORTED_UPLOAD_TYPES, key="roster_upload")
+        if roster_file is not None:
+            roster_bytes = roster_file.getvalue()
+            roster_hash = file_hash(roster_bytes)
+            # Only a new file replaces the grid's data, so edits made after an upload are kept
+            if st.session_state.get("roster_hash") != roster_hash:
+                try:
+                    st.session_state.influencer_df = load_influencer_roster(roster_hash, roster_bytes, roster_file.name)
+                    st.session_state.roster_hash = roster_hash
+                except Exception as e:
+                    st.error(f"Could not read '{roster_file.name}': {e}")
+        edited_influencers = st.data_editor(
+            st.session_state.influencer_df, key=f"influencer_editor_{st.session_state.get('roster_hash', 'manual')}", num_rows="dynamic", use_container_width=True, hide_index=True,
+            column_config={
+                "name": st.column_config.TextColumn("Name/Handle"),
+                "follower_count": st.column_config.NumberColumn("Followers", min_value=0, step=1, format="localized"),
+                "engagement_rate": st.column_config.NumberColumn("Engagement %", min_value=0.0, max_value=100.0, format="%.2f"),
+            }
+        )
+        st.caption(f"{len(edited_influencers):,} influencers")
     
     st.markdown("---")
 
@@ -189,49 +310,32 @@ elif not st.session_state.strategy_complete:
                 "avg_reach": owned_avg_reach,
                 "avg_engagement": owned_avg_engagement
             }
-            # Note: We read st.session_state.influencers directly here
+            # The grid's current contents feed the vectorized influencer model directly
             strategy_profile = generate_strategy(
                 objective,
                 investment,
                 st.session_state.metrics,
                 st.session_state.ai_categories,
-                st.session_state.influencers,
+                to_influencer_frame(edited_influencers),
                 owned_channel_data
             )
             st.session_state.strategy_profile = strategy_profile
             st.session_state.strategy_complete = True
             st.rerun()
 
-    # This part remains to display the results after submission
-    if st.session_state.get("strategy_complete"):
-        profile = st.session_state.strategy_profile
-        st.markdown("---")
-        st.subheader("Your Strategic Recommendation")
-
-        if profile.get("calculated_outputs"):
-             st.markdown("#### Calculated Profile Outputs")
-             df_outputs = pd.DataFrame([profile["calculated_outputs"]])
-             st.dataframe(df_outputs, use_container_width=True, hide_index=True)
-
-        if profile.get("prioritized_metrics"):
-            st.markdown("#### Metric Prioritization")
-            st.dataframe(pd.DataFrame(profile["prioritized_metrics"]), use_container_width=True)
-
-        if profile.get("strategic_considerations"):
-            st.markdown("#### Strategic Considerations")
-            for item in profile["strategic_considerations"]:
-                if item['type'] == 'Warning': st.warning(item['text'])
-                else: st.info(item['text'])
-
-        st.markdown("---")
-        if st.button("Proceed to Benchmark Calculation →", type="primary"):
-            st.rerun()
-
 # ================================================================================
 # Step 3: Optional Benchmark Calculation
 # ================================================================================
 elif not st.session_state.benchmark_flow_complete:
+    import pandas as pd
+    from data_processing import calculate_all_benchmarks, calculate_benchmarks_long
+    from importers import SUPPORTED_UPLOAD_TYPES, file_hash
+
     st.header("Step 3: Benchmark Calculation (Optional)")
+    # Step 2 hands over with a rerun, so its results are shown here
+    if st.session_state.get("strategy_profile"):
+        with st.expander("Your Strategic Recommendation", expanded=True):
+            render_strategy_profile(st.session_state.strategy_profile)
 
     benchmark_choice = st.radio(
         "Would you like to calculate proposed benchmark values using historical data?",
@@ -240,6 +344,42 @@ elif not st.session_state.benchmark_flow_complete:
     )
 
     if benchmark_choice == "Yes, calculate benchmarks from past events.":
+        entry_method = st.radio(
+            "How would you like to provide historical data?",
+            ("Upload a file (CSV, Parquet or Excel)", "Enter it manually for each metric"),
+            horizontal=True,
+            key="benchmark_entry_method"
+        )
+
+    if benchmark_choice == "Yes, calculate benchmarks from past events." and entry_method.startswith("Upload"):
+        # A single upload replaces the per-metric grids, so render cost no longer grows with the metric count
+        st.info("Upload one table in long format: one row per metric and past event, with the columns 'Metric', 'Event Name', 'Baseline (7-day)', 'Actual (7-day)' and optionally '3-Month Average'.")
+        uploaded_file = st.file_uploader("Historical data file", type=SUPPORTED_UPLOAD_TYPES, key="historical_upload")
+        if uploaded_file is not None:
+            file_bytes = uploaded_file.getvalue()
+            try:
+                historical_long_df, three_month_avgs = load_historical_upload(file_hash(file_bytes), file_bytes, uploaded_file.name)
+            except Exception as e:
+                st.error(f"Could not read '{uploaded_file.name}': {e}")
+            else:
+                selected = historical_long_df['Metric'].isin(st.session_state.metrics)
+                found_metrics = historical_long_df.loc[selected, 'Metric'].unique()
+                missing_metrics = [m for m in st.session_state.metrics if m not in set(found_metrics)]
+                st.caption(f"{int(selected.sum())} rows found for {len(found_metrics)} of your {len(st.session_state.metrics)} selected metrics.")
+                if missing_metrics:
+                    st.warning(f"No historical data for: {', '.join(missing_metrics)}")
+                st.dataframe(historical_long_df[selected].head(20), use_container_width=True, hide_index=True)
+
+                if st.button("Calculate All Proposed Benchmarks & Proceed →", type="primary"):
+                    with st.spinner("Analyzing historical data..."):
+                        summary_df, proposed_benchmarks, avg_actuals = calculate_benchmarks_long(historical_long_df[selected], three_month_avgs)
+                        st.session_state.benchmark_df = summary_df
+                        st.session_state.proposed_benchmarks = proposed_benchmarks
+                        st.session_state.avg_actuals = avg_actuals
+                        st.session_state.benchmark_flow_complete = True
+                    st.rerun()
+
+    elif benchmark_choice == "Yes, calculate benchmarks from past events.":
         with st.form("benchmark_data_form"):
             st.info("For each metric, provide its 3-month average from your external tool, then enter the Baseline and Actual values from past events to calculate the expected uplift.")
             historical_inputs = {}
@@ -267,9 +407,28 @@ elif not st.session_state.benchmark_flow_complete:
 # Step 4 & 5 - Main App Logic
 # ================================================================================
 else:
+    from data_processing import process_scorecard_data, compute_percent_difference
+    from moment_store import get_moment_store, session_workspace_id, workspace_id
+
+    # Saved moments live in the moment store; session state only holds lightweight handles.
+    # They belong to this session unless the user names a workspace to keep or share them.
+    moment_store = get_moment_store()
+    workspace_name = st.text_input(
+        "Workspace (optional)", key="workspace_name", placeholder="Moments are kept for this session only",
+        help="Enter a workspace name to keep your moments and reopen them later. Anyone who enters the same name sees the same moments."
+    ).strip()
+    moment_workspace = workspace_id(workspace_name) if workspace_name else st.session_state.setdefault("session_workspace", session_workspace_id())
+    # Listed on every run (handles only), so moments a teammate saves or deletes show up here
+    st.session_state.saved_moments = {h.name: h for h in moment_store.list(moment_workspace)}
+    st.session_state.moment_workspace = moment_workspace
+    # Moments saved in this session; only these are preselected for the presentation
+    session_moment_ids = st.session_state.setdefault("session_moment_ids", set())
+
     app_config = {
         'openai_api_key': st.session_state.openai_api_key,
         'metrics': st.session_state.metrics,
+        'ai_categories': st.session_state.get('ai_categories'),
+        'categorizer': get_session_categorizer(st.session_state.openai_api_key),
         'proposed_benchmarks': st.session_state.get('proposed_benchmarks'),
         'avg_actuals': st.session_state.get('avg_actuals')
     }
@@ -282,41 +441,80 @@ else:
     current_scorecard_df = next(iter(st.session_state.sheets_dict.values()), None)
 
     if current_scorecard_df is not None:
-        edited_df = st.data_editor(current_scorecard_df, key="moment_editor", use_container_width=True, num_rows="dynamic")
-        edited_df['Actuals'] = pd.to_numeric(edited_df['Actuals'], errors='coerce')
-        edited_df['Benchmark'] = pd.to_numeric(edited_df['Benchmark'], errors='coerce')
-        edited_df['% Difference'] = ((edited_df['Actuals'] - edited_df['Benchmark']) / edited_df['Benchmark'].replace(0, pd.NA)).apply(lambda x: f"{x:.1%}" if pd.notna(x) else None)
+        edited_df = st.data_editor(
+            current_scorecard_df, key="moment_editor", use_container_width=True, num_rows="dynamic",
+            # % Difference is stored as a ratio and only formatted for display
+            column_config={"% Difference": st.column_config.NumberColumn(format="percent", disabled=True)}
+        )
+        edited_df = compute_percent_difference(edited_df)
         
         col1, col2 = st.columns([3, 1])
         moment_name = col1.text_input("Name for this Scorecard Moment", placeholder="e.g., Pre-Reveal, Launch Week")
         
+        existing = st.session_state.saved_moments.get(moment_name)
+        overwrite = bool(existing) and col1.checkbox(f"Replace the saved moment '{moment_name}'", key="overwrite_moment")
+
         if col2.button("💾 Save Moment", use_container_width=True, type="primary"):
-            if moment_name:
-                st.session_state.saved_moments[moment_name] = edited_df
-                st.success(f"Saved moment: '{moment_name}'")
-                st.session_state.sheets_dict = None
-                st.rerun()
-            else:
+            if not moment_name:
                 st.error("Please enter a name for the moment before saving.")
+            elif existing and not overwrite:
+                st.error(f"A moment named '{moment_name}' is already saved. Choose another name or tick 'Replace'.")
+            else:
+                try:
+                    handle = moment_store.save(
+                        moment_workspace, moment_name, edited_df,
+                        benchmark_df=st.session_state.benchmark_df,
+                        metadata={'metrics': st.session_state.metrics, 'ai_categories': st.session_state.ai_categories},
+                        overwrite=overwrite
+                    )
+                except ValueError as e:
+                    # Someone else saved this name in a shared workspace meanwhile
+                    st.error(f"{e} Choose another name or tick 'Replace'.")
+                else:
+                    st.session_state.saved_moments[moment_name] = handle
+                    session_moment_ids.add(handle.moment_id)
+                    st.success(f"Saved moment: '{moment_name}'")
+                    st.session_state.sheets_dict = None
+                    st.rerun()
 
     if st.session_state.saved_moments:
         st.markdown("---")
         st.subheader("Saved Scorecard Moments")
-        if st.session_state.benchmark_df is not None and not st.session_stte.benchmark_df.empty:
+        if st.session_state.benchmark_df is not None and not st.session_state.benchmark_df.empty:
             with st.expander("View Benchmark Calculation Summary"):
                 st.dataframe(st.session_state.benchmark_df.set_index("Metric"), use_container_width=True)
         
-        for name, df in st.session_state.saved_moments.items():
-            with st.expander(f"View Moment: {name}"):
-                st.dataframe(df, use_container_width=True)
+        # Only the selected moment is loaded from the store
+        viewed_moment = st.selectbox("View a saved moment:", options=list(st.session_state.saved_moments.keys()), index=None, placeholder="Choose a moment")
+        if viewed_moment:
+            st.dataframe(moment_store.load(st.session_state.saved_moments[viewed_moment]), use_container_width=True)
+        col1, col2 = st.columns(2)
+        if viewed_moment and col1.button(f"🗑️ Delete '{viewed_moment}'", use_container_width=True):
+            handle = st.session_state.saved_moments.pop(viewed_moment)
+            moment_store.delete(handle)
+            session_moment_ids.discard(handle.moment_id)
+            st.rerun()
+        confirm_clear = col2.checkbox("Confirm deleting every moment in this workspace", key="confirm_clear_moments")
+        if col2.button("🗑️ Clear all saved moments", use_container_width=True, disabled=not confirm_clear):
+            moment_store.clear(moment_workspace)
+            st.session_state.saved_moments = {}
+            session_moment_ids.clear()
+            st.rerun()
         st.session_state.show_ppt_creator = True
 
     if st.session_state.get('show_ppt_creator'):
         st.markdown("---")
         st.header("Step 5: Create Presentation")
+        from style import STYLE_PRESETS
         
-        if st.session_state.get("presentation_buffer"):
-            st.download_button(label="✅ Download Your Presentation!", data=st.session_state.presentation_buffer, file_name="game_scorecard_presentation.pptx", use_container_width=True)
+        # Decks build in the background; the fragment polls the job and reruns the page when it is done
+        if st.session_state.get("presentation_job_id"):
+            render_presentation_job()
+        building = bool(st.session_state.get("presentation_job_id"))
+        for level, message in st.session_state.get("presentation_messages", []):
+            (st.error if level == "error" else st.warning)(message)
+        if st.session_state.get("presentation_buffer") and not building:
+            st.download_button(label="✅ Download Your Presentation!", data=st.session_state.presentation_buffer, file_name=st.session_state.get("presentation_filename", "game_scorecard_presentation.pptx"), use_container_width=True)
 
         with st.form("ppt_form"):
             st.subheader("Presentation Style & Details")
@@ -324,34 +522,36 @@ else:
             if st.session_state.saved_moments:
                 selected_moments = st.multiselect("Select which saved moments to include in the presentation:",
                     options=list(st.session_state.saved_moments.keys()),
-                    default=list(st.session_state.saved_moments.keys()))
+                    default=[name for name, h in st.session_state.saved_moments.items() if h.moment_id in session_moment_ids])
             else:
                 st.warning("No scorecard moments saved yet. Please save at least one moment above.")
                 selected_moments = []
 
             col1, col2 = st.columns(2)
             selected_style_name = col1.radio("Select Style Preset:", options=list(STYLE_PRESETS.keys()), horizontal=True)
-            image_region_prompt = col2.text_input("Region for AI Background Image", "Brazil")
+            image_region_prompt = col2.text_input("Region(s) for AI Background Image", "Brazil", help="Separate several regions with commas to get one deck per region (downloaded as a .zip).")
             ppt_title = st.text_input("Presentation Title", "Game Scorecard")
             ppt_subtitle = st.text_input("Presentation Subtitle", "A detailed analysis")
             
-            submitted = st.form_submit_button("Generate Presentation", use_container_width=True)
+            submitted = st.form_submit_button("Generate Presentation", use_container_width=True, disabled=building)
 
             if submitted:
                 if not selected_moments:
                     st.error("Please select at least one saved moment to include in the presentation.")
                 else:
-                    with st.spinner(f"Building presentation with {selected_style_name} style..."):
-                        presentation_data = {name: st.session_state.saved_moments[name] for name in selected_moments}
-                        style_guide = STYLE_PRESETS[selected_style_name]
-                        ppt_buffer = create_presentation(
-                            title=ppt_title,
-                            subtitle=ppt_subtitle,
-                            scorecard_moments=selected_moments,
-                            sheets_dict=presentation_data,
-                            style_guide=style_guide,
-                            region_prompt=image_region_prompt,
-                            openai_api_key=st.session_state.openai_api_key 
-                        )
-                        st.session_state["presentation_buffer"] = ppt_buffer
-                        st.rerun()
+                    from powerpoint import DeckBuildCache
+                    # The moments are loaded now, so edits made while the deck builds don't leak into it
+                    presentation_data = {name: moment_store.load(st.session_state.saved_moments[name]) for name in selected_moments}
+                    regions = list(dict.fromkeys(r.strip() for r in image_region_prompt.split(",") if r.strip())) or [image_region_prompt]
+                    job = get_job_runner().submit(
+                        build_presentation_download,
+                        ppt_title, ppt_subtitle, selected_moments, presentation_data, STYLE_PRESETS[selected_style_name], regions,
+                        st.session_state.openai_api_key,
+                        # Regenerating after a small edit only re-renders the moments that changed
+                        st.session_state.setdefault("deck_build_cache", DeckBuildCache()),
+                        name=f"Building presentation with {selected_style_name} style",
+                        owner=st.session_state.get("moment_workspace")
+                    )
+                    st.session_state.presentation_job_id = job.job_id
+                    st.session_state.presentation_messages = []
+                    st.rerun()
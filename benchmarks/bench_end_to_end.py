@@ -0,0 +1,155 @@
+"""
+End-to-end benchmark of categorization and deck generation against the offline OpenAI stub.
+
+    python benchmarks/bench_end_to_end.py                                  # default grid
+    python benchmarks/bench_end_to_end.py --moments 1 10 --metrics 10 100 --json results.json
+    python benchmarks/bench_end_to_end.py --baseline results.json --max-regression 0.25   # CI gate
+
+For every scenario the report shows p50/p95 wall time over --repeat runs, API calls per run
+and peak Python heap (tracemalloc, measured in one extra run so it does not slow the timed
+runs). Caches live in a temporary directory and are bypassed, so every run pays for its API
+calls. The client-side rate limits in http_client are lifted unless --keep-client-limits is
+given; use the stub's --rate-limit-* options to simulate a throttling server instead.
+
+Every scorecard sheet is rendered under every moment, so a deck has moments x moments tables;
+scenarios above --max-table-rows rendered rows are skipped (and listed as such).
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+# Keep the benchmark's caches away from the user's; must happen before the app modules are imported
+os.environ.setdefault("SCORECARD_CACHE_DIR", tempfile.mkdtemp(prefix="scorecard_bench_"))
+
+import numpy as np
+
+import http_client
+from categorization import get_ai_metric_categories
+from powerpoint import create_presentation
+from style import STYLE_PRESETS
+from fixtures import make_scorecard
+from openai_stub import StubOpenAI
+
+STUB_API_KEY = "sk-offline-stub"
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a small sample."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(np.ceil(q / 100 * len(ordered))) - 1))]
+
+
+def build_scenarios(moment_counts, metric_counts, max_table_rows, style_guide):
+    """Returns (name, callable, skip_reason) for every scenario in the grid."""
+    scenarios = []
+    for metrics in metric_counts:
+        names = [f"Metric {i}" for i in range(metrics)]
+        scenarios.append((f"categorize/{metrics}", lambda names=names: get_ai_metric_categories(names, STUB_API_KEY, use_cache=False), None))
+    for moments in moment_counts:
+        for metrics in metric_counts:
+            table_rows = moments * moments * metrics
+            sheets = {f"Moment {i}": make_scorecard(metrics, seed=i) for i in range(moments)}
+            run = lambda sheets=sheets: create_presentation("Benchmark", "Offline stub", list(sheets), sheets, style_guide, "Brazil",
+                                                           STUB_API_KEY, use_image_cache=False)
+            skip = f"{table_rows} table rows > --max-table-rows" if table_rows > max_table_rows else None
+            scenarios.append((f"deck/{moments}x{metrics}", run, skip))
+    return scenarios
+
+
+def measure(run, stub, repeat):
+    timings, calls = [], []
+    for _ in range(repeat):
+        stub.reset()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+        calls.append(stub.total_calls)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "p50_s": percentile(timings, 50),
+        "p95_s": percentile(timings, 95),
+        "api_calls": max(calls),
+        "api_failures": sum(stub.failures.values()),
+        "peak_py_mb": peak / 1024 / 1024,
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Returns a list of regression messages against a previous --json report."""
+    problems = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or "p50_s" not in current or "p50_s" not in previous:
+            continue
+        if current["p50_s"] > previous["p50_s"] * (1 + max_regression):
+            problems.append(f"{name}: p50 {current['p50_s']:.3f}s vs baseline {previous['p50_s']:.3f}s")
+        if current["api_calls"] > previous["api_calls"]:
+            problems.append(f"{name}: {current['api_calls']} API calls vs baseline {previous['api_calls']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--moments", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--metrics", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--style", default=next(iter(STYLE_PRESETS)), choices=list(STYLE_PRESETS))
+    parser.add_argument("--max-table-rows", type=int, default=100_000, help="Skip decks rendering more table rows than this.")
+    parser.add_argument("--latency-chat", type=float, default=0.05, help="Stub chat completion latency (s).")
+    parser.add_argument("--latency-images", type=float, default=0.2, help="Stub image generation latency (s).")
+    parser.add_argument("--latency-download", type=float, default=0.05, help="Stub image download latency (s).")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency as a fraction of the base latency.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability that a stub call answers 500.")
+    parser.add_argument("--rate-limit-chat", type=float, default=None, help="Stub chat requests per second before 429s.")
+    parser.add_argument("--rate-limit-images", type=float, default=None, help="Stub image requests per second before 429s.")
+    parser.add_argument("--keep-client-limits", action="store_true", help="Keep http_client's own token buckets.")
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON.")
+    parser.add_argument("--baseline", metavar="PATH", help="Fail if a scenario regresses against this --json report.")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed p50 slowdown vs the baseline (fraction).")
+    args = parser.parse_args(argv)
+
+    rate_limit = {endpoint: rate for endpoint, rate in (("chat", args.rate_limit_chat), ("images", args.rate_limit_images)) if rate}
+    stub = StubOpenAI(latency={"chat": args.latency_chat, "images": args.latency_images, "download": args.latency_download},
+                      jitter=args.jitter, failure_rate=args.failure_rate, rate_limit=rate_limit).install()
+    if not args.keep_client_limits:
+        for endpoint in list(http_client.RATE_LIMITS):
+            http_client.set_rate_limit(endpoint, 1e9, 10 ** 9)
+
+    results = {}
+    print(f"{'scenario':<18} {'p50 (s)':>9} {'p95 (s)':>9} {'API calls':>10} {'peak MB':>9}")
+    for name, run, skip in build_scenarios(args.moments, args.metrics, args.max_table_rows, STYLE_PRESETS[args.style]):
+        if skip:
+            results[name] = {"skipped": skip}
+            print(f"{name:<18} skipped: {skip}")
+            continue
+        results[name] = measure(run, stub, args.repeat)
+        r = results[name]
+        print(f"{name:<18} {r['p50_s']:>9.3f} {r['p95_s']:>9.3f} {r['api_calls']:>10} {r['peak_py_mb']:>9.1f}", flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(results, json.load(f), args.max_regression)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Compares the fast table writer in add_df_to_slide with the original cell-by-cell path.
+
+    python benchmarks/bench_table_writer.py --rows 20 60 200 --repeat 5
+
+Both paths must produce the same table XML; the script checks that before timing.
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+from style import STYLE_PRESETS
+from powerpoint import add_df_to_slide
+from fixtures import make_scorecard
+
+
+def build(df, style_guide, fast_table):
+    prs = Presentation()
+    prs.slide_width = Inches(16); prs.slide_height = Inches(9)
+    started = time.perf_counter()
+    add_df_to_slide(prs, df, "BENCHMARK", style_guide, fast_table=fast_table)
+    elapsed = time.perf_counter() - started
+    table = next(shape for shape in prs.slides[0].shapes if shape.has_table).table
+    return elapsed, etree.tostring(table._tbl)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 60, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--style", default=next(iter(STYLE_PRESETS)), choices=list(STYLE_PRESETS))
+    args = parser.parse_args(argv)
+
+    style_guide = STYLE_PRESETS[args.style]
+    print(f"{'rows':>6} {'original (ms)':>14} {'fast (ms)':>10} {'speedup':>8}")
+    for rows in args.rows:
+        df = make_scorecard(rows, metric_suffix=" & <co>", percent_as_text=True)
+        _, original_xml = build(df, style_guide, fast_table=False)
+        _, fast_xml = build(df, style_guide, fast_table=True)
+        if original_xml != fast_xml:
+            raise SystemExit(f"Table XML differs between writers for {rows} rows")
+        original = min(build(df, style_guide, fast_table=False)[0] for _ in range(args.repeat))
+        fast = min(build(df, style_guide, fast_table=True)[0] for _ in range(args.repeat))
+        print(f"{rows:>6} {original * 1000:>14.1f} {fast * 1000:>10.1f} {original / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Synthetic scorecards shared by the benchmark scripts, so every benchmark measures the same shape of data.
+"""
+import numpy as np
+import pandas as pd
+
+
+def make_scorecard(rows, seed=0, metric_suffix="", percent_as_text=False):
+    """
+    A scorecard in the app's layout: rows sorted into Reach/Depth/Action blocks, the category
+    shown only on each block's first row, and '% Difference' as a ratio (or as display text,
+    as the table writer receives it, with percent_as_text). metric_suffix is appended to every
+    metric name, e.g. characters that need XML escaping.
+    """
+    rng = np.random.default_rng(seed)
+    categories = np.array(["Reach", "Depth", "Action"])[np.sort(rng.integers(0, 3, rows))]
+    df = pd.DataFrame({
+        "Category": categories,
+        "Metric": [f"Metric {i}{metric_suffix}" for i in range(rows)],
+        "Actuals": rng.random(rows) * 1e6,
+        "Benchmark": rng.random(rows) * 1e6,
+    })
+    df["% Difference"] = (df["Actuals"] - df["Benchmark"]) / df["Benchmark"]
+    if percent_as_text:
+        df["% Difference"] = df["% Difference"].map(lambda x: f"{x:.1%}")
+    df.loc[df["Category"] == df["Category"].shift(), "Category"] = ""
+    return df
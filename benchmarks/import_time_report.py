@@ -0,0 +1,114 @@
+"""
+Import-time report for the app's modules, based on `python -X importtime`.
+
+    python benchmarks/import_time_report.py                 # table
+    python benchmarks/import_time_report.py --json          # machine-readable, for CI
+    python benchmarks/import_time_report.py --budget categorization=150 --forbid categorization=pandas,numpy,requests,pptx
+
+Each module is imported in a fresh interpreter. The report shows its total (cumulative)
+import time, the slowest third-party packages it pulled in, and which heavy libraries it
+loaded. --budget (ms) and --forbid make the script exit non-zero so CI catches regressions.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Roughly the order in which the Streamlit steps first need them
+DEFAULT_MODULES = ["feedback", "ui", "categorization", "strategy", "data_processing", "importers", "style", "excel", "powerpoint"]
+HEAVY_PACKAGES = ["streamlit", "pandas", "numpy", "requests", "pptx", "matplotlib", "openpyxl"]
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module, repeat=3):
+    """
+    Imports `module` in fresh interpreters and returns the fastest run as {package: cumulative_us},
+    limited to the module itself and what it imported (interpreter start-up imports are excluded).
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+        entries = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                entries.append((match.group(4), int(match.group(2)), len(match.group(3))))
+        # -X importtime prints children before their parent, indented one level deeper
+        end = max(i for i, (name, _, _) in enumerate(entries) if name == module)
+        root_indent = entries[end][2]
+        start = end
+        while start > 0 and entries[start - 1][2] > root_indent:
+            start -= 1
+        cumulative = {}
+        for name, us, _ in entries[start:end + 1]:
+            cumulative[name] = max(cumulative.get(name, 0), us)
+        if best is None or cumulative[module] < best[module]:
+            best = cumulative
+    return best
+
+
+def summarize(module, cumulative, top=5):
+    top_level = {name: us for name, us in cumulative.items() if "." not in name and name != module}
+    return {
+        "module": module,
+        "total_ms": round(cumulative.get(module, 0) / 1000, 1),
+        "heavy_packages": [pkg for pkg in HEAVY_PACKAGES if pkg in cumulative],
+        "slowest": [{"package": name, "ms": round(us / 1000, 1)} for name, us in sorted(top_level.items(), key=lambda kv: -kv[1])[:top]],
+    }
+
+
+def parse_pairs(values, convert):
+    pairs = {}
+    for value in values or []:
+        module, _, setting = value.partition("=")
+        pairs[module] = convert(setting)
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import time per module.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is reported.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--budget", action="append", metavar="MODULE=MS", help="Fail if MODULE takes longer than MS to import.")
+    parser.add_argument("--forbid", action="append", metavar="MODULE=PKG,PKG", help="Fail if MODULE imports any of the listed packages.")
+    args = parser.parse_args(argv)
+
+    budgets = parse_pairs(args.budget, float)
+    forbidden = parse_pairs(args.forbid, lambda s: [p for p in s.split(",") if p])
+    modules = list(dict.fromkeys(args.modules + list(budgets) + list(forbidden)))
+
+    report, failures = [], []
+    for module in modules:
+        cumulative = measure(module, args.repeat)
+        summary = summarize(module, cumulative)
+        report.append(summary)
+        if module in budgets and summary["total_ms"] > budgets[module]:
+            failures.append(f"{module}: {summary['total_ms']}ms exceeds budget of {budgets[module]}ms")
+        leaked = [pkg for pkg in forbidden.get(module, []) if pkg in cumulative]
+        if leaked:
+            failures.append(f"{module}: imports forbidden package(s) {', '.join(leaked)}")
+
+    if args.json:
+        print(json.dumps({"modules": report, "failures": failures}, indent=2))
+    else:
+        print(f"{'module':<18} {'total ms':>9}  heavy packages / slowest imports")
+        for summary in report:
+            slowest = ", ".join(f"{s['package']} {s['ms']}ms" for s in summary["slowest"][:3])
+            print(f"{summary['module']:<18} {summary['total_ms']:>9}  [{', '.join(summary['heavy_packages'])}] {slowest}")
+        for failure in failures:
+            print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
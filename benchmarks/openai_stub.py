@@ -0,0 +1,170 @@
+"""
+Offline stand-in for the OpenAI endpoints the app calls, mounted as a requests transport.
+
+    from openai_stub import StubOpenAI     # benchmarks/ and the repo root on sys.path
+    stub = StubOpenAI(latency={"chat": 0.8, "images": 2.0, "download": 0.3}, failure_rate=0.05)
+    stub.install()          # every http_client call to api.openai.com now goes to the stub
+
+It answers chat completions (metric categorization) and image generations, and serves the
+generated image URLs. Latency, random 5xx failures and a per-endpoint rate limit (429 with
+Retry-After) are configurable, and every call is counted so benchmarks can report API usage.
+"""
+import hashlib
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+import http_client
+
+OPENAI_PREFIX = "https://api.openai.com/"
+IMAGE_HOST_PREFIX = "https://stub-images.invalid/"
+CATEGORIES = ("Reach", "Depth", "Action")
+METRIC_LIST = re.compile(r"^\s*(\[.*\])\s*$", re.MULTILINE)
+
+
+def solid_png(width=1792, height=1024, rgb=(40, 40, 40)):
+    """A valid PNG of one solid color, built with the standard library only."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    row = b"\x00" + bytes(rgb) * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(row * height, 9)) + chunk(b"IEND", b"")
+
+
+def stub_category(metric):
+    """Deterministic category for a metric name, so repeated runs give the same answers."""
+    return CATEGORIES[hashlib.sha256(metric.encode("utf-8")).digest()[0] % len(CATEGORIES)]
+
+
+class StubOpenAI(BaseAdapter):
+    """
+    requests transport adapter imitating api.openai.com.
+
+    latency:      seconds per call, either one number or {"chat", "images", "download"}
+    jitter:       extra uniformly random delay, as a fraction of the latency
+    failure_rate: probability that a call answers 500 instead
+    malformed_rate: probability that a chat reply's content is truncated, invalid JSON
+    rate_limit:   {"chat" | "images": requests per second}; calls above it get a 429 with Retry-After
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, malformed_rate=0.0, rate_limit=None, retry_after=1.0, image_bytes=None, seed=0):
+        super().__init__()
+        self.latency = latency if isinstance(latency, dict) else {"chat": latency, "images": latency, "download": latency}
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.rate_limit = dict(rate_limit or {})
+        self.retry_after = retry_after
+        self.image_bytes = image_bytes if image_bytes is not None else solid_png()
+        self.calls = Counter()
+        self.failures = Counter()
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._recent = {endpoint: deque() for endpoint in self.rate_limit}
+        self._lock = threading.Lock()
+
+    # ----- wiring ---------------------------------------------------------------
+    def install(self):
+        """Mounts the stub on the shared http_client session (for this process)."""
+        http_client.mount_adapter(OPENAI_PREFIX, self)
+        http_client.mount_adapter(IMAGE_HOST_PREFIX, self)
+        return self
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear(); self.failures.clear(); self.bytes_sent = 0
+            for recent in self._recent.values():
+                recent.clear()
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    # ----- transport ------------------------------------------------------------
+    def send(self, request, **kwargs):
+        path = urlsplit(request.url).path
+        if request.url.startswith(IMAGE_HOST_PREFIX):
+            endpoint = "download"
+        elif path.endswith("/chat/completions"):
+            endpoint = "chat"
+        elif path.endswith("/images/generations"):
+            endpoint = "images"
+        else:
+            return self._response(request, 404, {"error": {"message": f"Stub has no route for {path}"}})
+
+        with self._lock:
+            self.calls[endpoint] += 1
+            failed = self._random.random() < self.failure_rate
+            throttled = self._over_rate_limit(endpoint)
+            delay = self.latency.get(endpoint, 0.0) * (1 + self.jitter * self._random.random())
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            with self._lock:
+                self.failures["429"] += 1
+            return self._response(request, 429, {"error": {"message": "Rate limit reached"}}, headers={"Retry-After": str(self.retry_after)})
+        if failed:
+            with self._lock:
+                self.failures["500"] += 1
+            return self._response(request, 500, {"error": {"message": "Stubbed server error"}})
+
+        if endpoint == "chat":
+            return self._response(request, 200, self._chat_completion(request))
+        if endpoint == "images":
+            payload = json.loads(request.body or b"{}")
+            image_id = hashlib.sha256(f"{payload.get('prompt')}|{time.monotonic_ns()}".encode("utf-8")).hexdigest()[:16]
+            return self._response(request, 200, {"created": int(time.time()), "data": [{"url": f"{IMAGE_HOST_PREFIX}{image_id}.png"}]})
+        return self._response(request, 200, self.image_bytes, content_type="image/png")
+
+    def close(self):
+        pass
+
+    def _over_rate_limit(self, endpoint):
+        rate = self.rate_limit.get(endpoint)
+        if not rate:
+            return False
+        now, recent = time.monotonic(), self._recent[endpoint]
+        while recent and now - recent[0] >= 1.0:
+            recent.popleft()
+        if len(recent) >= rate:
+            return True
+        recent.append(now)
+        return False
+
+    def _chat_completion(self, request):
+        payload = json.loads(request.body or b"{}")
+        prompt = payload["messages"][-1]["content"]
+        match = METRIC_LIST.search(prompt)
+        metrics = json.loads(match.group(1)) if match else []
+        content = json.dumps({metric: stub_category(metric) for metric in metrics})
+        with self._lock:
+            malformed = self._random.random() < self.malformed_rate
+            if malformed:
+                self.failures["malformed"] += 1
+        if malformed:
+            content = content[:len(content) // 2]
+        return {"id": "chatcmpl-stub", "object": "chat.completion", "model": payload.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]}
+
+    def _response(self, request, status, body, headers=None, content_type="application/json"):
+        response = Response()
+        response.status_code = status
+        response.reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}[status]
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        response.headers = CaseInsensitiveDict({"Content-Type": content_type, "Content-Length": str(len(response._content)), **(headers or {})})
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        with self._lock:
+            self.bytes_sent += len(response._content)
+        return response
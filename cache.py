@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import threading
+import time
+import hashlib
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+# ================================================================================
+# Disk-backed Cache
+# ================================================================================
+# Cached data lives in one SQLite file per cache name. The location can be moved
+# with the SCORECARD_CACHE_DIR environment variable (e.g. onto a shared volume).
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SCORECARD_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "scorecard_generator")
+)
+
+
+def content_key(*parts) -> str:
+    """Builds a stable, content-addressed key (sha256 hex) from the given parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    A small SQLite-backed key/value store for bytes.
+
+    Entries older than `ttl_seconds` are treated as missing. When the cache grows
+    past `max_entries` or `max_bytes`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, name: str, cache_dir: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.path = os.path.join(self.cache_dir, f"{name}.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        with self._lock:
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _min_created_at(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else float("-inf")
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Returns the live entries for the given keys and marks them as recently used."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = {}
+        with self._connect() as conn:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders}) AND created_at >= ?",
+                    (*chunk, self._min_created_at())
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                conn.executemany("UPDATE entries SET accessed_at = ? WHERE key = ?", [(now, k) for k in found])
+        return found
+
+    def set(self, key: str, value: bytes):
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, bytes]):
+        if not items:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                [(k, sqlite3.Binary(v), len(v), now, now) for k, v in items.items()]
+            )
+            self._evict(conn)
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def _evict(self, conn):
+        """Drops expired entries, then the least recently used ones until within bounds."""
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM entries WHERE created_at < ?", (self._min_created_at(),))
+        if self.max_entries is not None:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        if self.max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                doomed = []
+                for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
@@ -0,0 +1,307 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import feedback
+import tracing
+from cache import DiskCache, content_key
+
+# This module deliberately avoids pandas/numpy/requests at import time so Step 1 stays light.
+
+# ================================================================================
+# AI Metric Categorization using OpenAI API
+# ================================================================================
+VALID_CATEGORIES = ("Reach", "Depth", "Action")
+CATEGORIZATION_MODEL = "gpt-4-turbo"
+# Bump this whenever the prompt changes so stale cached answers are not reused.
+CATEGORIZATION_PROMPT_VERSION = 1
+CATEGORY_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+CATEGORY_CACHE_MAX_ENTRIES = 10000
+# Large metric lists are split into chunks bounded by metric count and prompt characters,
+# sent concurrently; chunks whose reply is unusable are retried on their own.
+CATEGORIZATION_CHUNK_SIZE = 50
+CATEGORIZATION_CHUNK_MAX_CHARS = 4000
+CATEGORIZATION_MAX_CONCURRENCY = 4
+CATEGORIZATION_CHUNK_RETRIES = 2
+CATEGORIZATION_API_URL = "https://api.openai.com/v1/chat/completions"
+
+_category_cache = None
+
+def get_category_cache() -> DiskCache:
+    """Returns the shared on-disk cache of metric categories, creating it on first use."""
+    global _category_cache
+    if _category_cache is None:
+        _category_cache = DiskCache("metric_categories", ttl_seconds=CATEGORY_CACHE_TTL_SECONDS, max_entries=CATEGORY_CACHE_MAX_ENTRIES)
+    return _category_cache
+
+def normalize_metric_name(metric: str) -> str:
+    """Case- and whitespace-insensitive form of a metric name, used for cache keys."""
+    return " ".join(str(metric).split()).casefold()
+
+def _category_cache_key(metric: str) -> str:
+    return content_key(CATEGORIZATION_MODEL, CATEGORIZATION_PROMPT_VERSION, normalize_metric_name(metric))
+
+# ================================================================================
+# Local Rule-Based Classifier
+# ================================================================================
+# Most metric names say what they measure. A keyword/regex table settles those
+# locally (offline, in microseconds) and only the ambiguous rest goes to the API.
+# Rules are (category, weight, pattern); patterns match whole words in the
+# normalized (casefolded) name. Where matches overlap, the longest one wins
+# ("view duration" over "view"), whatever the order of the table.
+LOCAL_RULES: List[Tuple[str, int, str]] = [
+    # Reach: did we hit sufficient scale?
+    ("Reach", 3, r"impressions?"), ("Reach", 3, r"reach"), ("Reach", 3, r"share of voice|sov"),
+    ("Reach", 2, r"(?:video |page |unique )?views?|viewers?|viewership"), ("Reach", 2, r"followers?|subscribers?|fans?"),
+    ("Reach", 2, r"awareness|mentions?|coverage|articles?|press"), ("Reach", 2, r"visits?|visitors?|traffic|sessions?"),
+    ("Reach", 2, r"audience|circulation|exposure|uniques?"),
+    # Depth: did we meaningfully engage?
+    ("Depth", 3, r"engagements?(?: rate)?|er|interactions?"), ("Depth", 3, r"click[- ]?through(?: rate)?|ctr|clicks?"),
+    ("Depth", 3, r"watch ?time|view duration|time spent|dwell time|avg\.? session (?:length|duration)"),
+    ("Depth", 3, r"view[- ]?through(?: rate)?|vtr|completion rate|completions?"),
+    ("Depth", 2, r"likes?|comments?|shares?|saves?|retweets?|reposts?|reactions?|replies"),
+    ("Depth", 2, r"sentiment|open rate|opens|bounce rate|scroll depth"),
+    # Action: did they take action?
+    ("Action", 3, r"sign[- ]?ups?|registrations?|registered|enrollments?"), ("Action", 3, r"downloads?|installs?"),
+    ("Action", 3, r"purchases?|pre[- ]?orders?|orders?|sales|revenue|conversions?(?: rate)?|cvr"),
+    ("Action", 3, r"dau|mau|wau|active (?:users|players)|players?|playtime|logins?"),
+    ("Action", 2, r"wishlists?(?: adds)?|redemptions?|leads?|applications?|subscriptions?|tickets?|attendees?|rsvps?|joins?"),
+]
+# A local answer is used when the best category scores at least this much and
+# takes at least LOCAL_MIN_CONFIDENCE of all matched weight; otherwise the API decides.
+LOCAL_MIN_SCORE = 2
+LOCAL_MIN_CONFIDENCE = 0.75
+
+
+class RuleClassifier:
+    """Classifies metric names with a precompiled rule table, scoring the longest match wherever rules overlap."""
+
+    def __init__(self, rules: Sequence[Tuple[str, int, str]] = LOCAL_RULES,
+                 min_score: int = LOCAL_MIN_SCORE, min_confidence: float = LOCAL_MIN_CONFIDENCE):
+        self.min_score = min_score
+        self.min_confidence = min_confidence
+        self._rules = [(category, weight, re.compile(rf"\b(?:{pattern})\b")) for category, weight, pattern in rules]
+
+    def scores(self, metric: str) -> Dict[str, int]:
+        name = normalize_metric_name(metric).replace("_", " ")
+        # Every rule's matches, longest first; a match is scored unless a longer one already covers part of it
+        matches = sorted(((match.end() - match.start(), match.start(), match.end(), category, weight)
+                          for category, weight, pattern in self._rules for match in pattern.finditer(name)),
+                         key=lambda m: (-m[0], m[1]))
+        scores, taken = {}, []
+        for _, start, end, category, weight in matches:
+            if any(start < other_end and other_start < end for other_start, other_end in taken):
+                continue
+            taken.append((start, end))
+            scores[category] = scores.get(category, 0) + weight
+        return scores
+
+    def classify(self, metric: str) -> Tuple[Optional[str], float]:
+        """Returns (category, confidence), or (None, confidence) when the rules are not sure enough."""
+        scores = self.scores(metric)
+        if not scores:
+            return None, 0.0
+        category, best = max(scores.items(), key=lambda item: item[1])
+        confidence = best / sum(scores.values())
+        if best < self.min_score or confidence < self.min_confidence:
+            return None, confidence
+        return category, confidence
+
+    def classify_many(self, metrics: Iterable[str]) -> Dict[str, str]:
+        """Categories for the metrics the rules are confident about; the rest are left out."""
+        categories = {}
+        for metric in metrics:
+            category, _ = self.classify(metric)
+            if category is not None:
+                categories[metric] = category
+        return categories
+
+
+_local_classifier = None
+
+def get_local_classifier() -> RuleClassifier:
+    """Returns the shared RuleClassifier for LOCAL_RULES, compiling it on first use."""
+    global _local_classifier
+    if _local_classifier is None:
+        _local_classifier = RuleClassifier()
+    return _local_classifier
+
+def chunk_metrics(metrics: List[str], max_metrics: int = CATEGORIZATION_CHUNK_SIZE, max_chars: int = CATEGORIZATION_CHUNK_MAX_CHARS) -> List[List[str]]:
+    """Splits metrics, in order, into chunks of at most max_metrics names and ~max_chars of JSON."""
+    chunks, current, size = [], [], 0
+    for metric in metrics:
+        cost = len(json.dumps(metric)) + 2
+        if current and (len(current) >= max_metrics or size + cost > max_chars):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(metric)
+        size += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _categorization_prompt(metrics: List[str]) -> str:
+    return f"""
+    You are an expert marketing analyst. Your task is to categorize a list of metrics into one of three categories: 'Reach', 'Depth', or 'Action'.
+
+    Here are the definitions:
+    - **Reach**: Did we hit sufficient scale?
+    - **Depth**: Did we meaningfully engage?
+    - **Action**: Did they take action?
+
+    Here is the list of metrics to categorize:
+    {json.dumps(metrics)}
+
+    Respond *only* with a single JSON object where keys are the metrics and values are their category. The category must be one of "Reach", "Depth", or "Action".
+    """
+
+def _categorize_chunk(metrics: List[str], api_key: str) -> Dict[str, str]:
+    """
+    Sends one chunk and returns the valid categories found in the reply. Raises on HTTP
+    errors and on replies that are not a JSON object; metrics missing from the reply or
+    given an unknown category are simply absent from the result.
+    """
+    import http_client  # requests is only loaded once an API call is actually needed
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    payload = {"model": CATEGORIZATION_MODEL, "messages": [{"role": "user", "content": _categorization_prompt(metrics)}], "response_format": {"type": "json_object"}, "temperature": 0.1}
+    with tracing.span("categorize.api", metrics=len(metrics)):
+        response = http_client.post(CATEGORIZATION_API_URL, headers=headers, json=payload, timeout=30)
+        response.raise_for_status()
+        ai_result = json.loads(response.json()['choices'][0]['message']['content'])
+    if not isinstance(ai_result, dict):
+        raise ValueError("the reply was not a JSON object")
+
+    # Match the AI's keys back to the requested names, tolerating case/spacing changes
+    by_normalized_name = {normalize_metric_name(k): v for k, v in ai_result.items()}
+    categories = {}
+    for metric in metrics:
+        category = ai_result.get(metric, by_normalized_name.get(normalize_metric_name(metric)))
+        if category in VALID_CATEGORIES:
+            categories[metric] = category
+    return categories
+
+def get_ai_metric_categories(metrics: list, api_key: str, use_cache: bool = True,
+                             chunk_size: int = CATEGORIZATION_CHUNK_SIZE, max_concurrency: int = CATEGORIZATION_MAX_CONCURRENCY,
+                             max_retries: int = CATEGORIZATION_CHUNK_RETRIES, use_local_rules: bool = True) -> dict:
+    """
+    Uses the OpenAI API to categorize a list of metrics.
+    Categories already in the on-disk cache are reused; of the rest, with use_local_rules, metrics the
+    local RuleClassifier is confident about are settled without any network I/O, so only unseen,
+    ambiguous metrics are sent to the API.
+    Long lists are sent as size-bounded chunks, up to max_concurrency at a time. A chunk that
+    fails or comes back malformed is retried (up to max_retries times) without resending the
+    others; metrics a reply left out or miscategorized are retried the same way.
+    """
+    if not metrics:
+        return {}
+
+    metrics = list(dict.fromkeys(metrics))
+    categories = {}
+    if use_cache:
+        keys = {metric: _category_cache_key(metric) for metric in metrics}
+        cached = get_category_cache().get_many(keys.values())
+        categories = {metric: cached[key].decode("utf-8") for metric, key in keys.items() if key in cached}
+        tracing.count("cache.categories.hits", len(categories))
+        tracing.count("cache.categories.misses", len(metrics) - len(categories))
+    if use_local_rules:
+        # Cached answers (from the API) take precedence; the rules only settle metrics never seen before
+        local = get_local_classifier().classify_many(m for m in metrics if m not in categories)
+        tracing.count("categories.local", len(local))
+        categories.update(local)
+
+    uncached_metrics = [m for m in metrics if m not in categories]
+    if not uncached_metrics:
+        return categories
+    if not api_key:
+        if categories:
+            feedback.warning(f"{len(uncached_metrics)} metric(s) could not be categorized locally and no OpenAI API key is set; they will be Uncategorized.")
+        else:
+            feedback.error("OpenAI API key is required for AI categorization.")
+        return categories
+
+    feedback.info("Asking AI to categorize metrics...")
+    new_categories, pending, last_error = {}, chunk_metrics(uncached_metrics, chunk_size), None
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(pending)))) if len(pending) > 1 else None
+    try:
+        for _ in range(max_retries + 1):
+            if not pending:
+                break
+            futures = [executor.submit(_categorize_chunk, chunk, api_key) if executor else None for chunk in pending]
+            retry = []
+            for chunk, future in zip(pending, futures):
+                try:
+                    result = future.result() if future is not None else _categorize_chunk(chunk, api_key)
+                except Exception as e:
+                    last_error = e
+                    retry.append(chunk)
+                    continue
+                new_categories.update(result)
+                missing = [m for m in chunk if m not in result]
+                if missing:
+                    last_error = ValueError(f"no valid category for {len(missing)} metric(s)")
+                    retry.append(missing)
+            pending = retry
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if pending:
+        failed = sum(len(chunk) for chunk in pending)
+        feedback.error(f"AI categorization failed for {failed} of {len(uncached_metrics)} metric(s): {last_error}")
+
+    if use_cache:
+        get_category_cache().set_many({_category_cache_key(m): c.encode("utf-8") for m, c in new_categories.items()})
+    categories.update(new_categories)
+    return categories
+
+# ================================================================================
+# Categorization Service
+# ================================================================================
+class CategorizationService:
+    """
+    Memoizes metric categories for a single user session.
+
+    Once a metric has a category it is not sent to get_ai_metric_categories (and from
+    there to the disk cache or the API) again for this service instance, so rebuilding
+    the scorecard after every saved moment costs no extra round-trips. Metrics that came
+    back without a category (API or chunk failure, no key) are asked for again next time.
+    """
+
+    def __init__(self, api_key: Optional[str], categories: Optional[Dict[str, str]] = None):
+        self.api_key = api_key
+        self._categories = {}
+        self.seed(categories or {})
+
+    def seed(self, categories: Dict[str, str]):
+        """Records categories that were computed elsewhere (e.g. in Step 1)."""
+        self._categories.update(categories)
+
+    def categorize(self, metrics: Iterable[str]) -> Dict[str, str]:
+        metrics = list(dict.fromkeys(metrics))
+        pending = [m for m in metrics if m not in self._categories]
+        if pending:
+            self._categories.update(get_ai_metric_categories(pending, self.api_key))
+        return {m: self._categories[m] for m in metrics if m in self._categories}
+
+    def missing(self, metrics: Iterable[str]) -> List[str]:
+        """The metrics that have no category yet."""
+        return [m for m in dict.fromkeys(metrics) if m not in self._categories]
+
+    def invalidate(self, metrics: Optional[Iterable[str]] = None):
+        """Forgets the given metrics (or everything) so the next call asks again."""
+        if metrics is None:
+            self._categories.clear()
+            return
+        for metric in metrics:
+            self._categories.pop(metric, None)
+
+
+def get_session_categorizer(api_key: Optional[str]) -> CategorizationService:
+    """Returns the CategorizationService stored in this Streamlit session, creating it if needed."""
+    import streamlit as st
+    categorizer = st.session_state.get('categorizer')
+    if categorizer is None or categorizer.api_key != api_key:
+        categorizer = CategorizationService(api_key)
+        st.session_state.categorizer = categorizer
+    return categorizer
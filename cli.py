@@ -0,0 +1,229 @@
+"""
+Headless batch runner: builds scorecards, .pptx decks and .xlsx workbooks without Streamlit.
+
+    python cli.py jobs.json --out output/ --workers 8
+
+The job file is JSON with an optional "defaults" object merged into every entry of "jobs":
+
+    {
+      "defaults": {"style": "FC_Custom", "subtitle": "A detailed analysis"},
+      "jobs": [
+        {
+          "name": "summer_launch",
+          "title": "Summer Launch Scorecard",
+          "metrics": ["Social Impressions", "DAU"],
+          "ai_categories": {"DAU": "Action"},
+          "historical_data": {
+            "Social Impressions": {
+              "three_month_avg": 120000,
+              "events": [{"Event Name": "Spring Reveal", "Baseline (7-day)": 90000, "Actual (7-day)": 150000}]
+            }
+          },
+          "moments": {
+            "Pre-Reveal": {"Social Impressions": 130000, "DAU": {"Actuals": 5400, "Benchmark": 5000}}
+          },
+          "regions": ["Brazil", "Mexico"]
+        }
+      ]
+    }
+
+Every (job, region) pair becomes one deck; the workbook is written once per job. Jobs are
+spread across a process pool; within a job, all regional decks are built in one pass that
+renders the shared slides once and generates only the background images per region. The OpenAI key is read from OPENAI_API_KEY (or --api-key-env);
+without it, decks use solid backgrounds and only cached or supplied categories are used.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import http_client
+import tracing
+from categorization import VALID_CATEGORIES
+from style import STYLE_PRESETS
+from data_processing import process_scorecard_data, calculate_all_benchmarks, fill_moment_scorecard
+from powerpoint import create_region_presentations
+from excel import write_excel_stream
+
+logger = logging.getLogger("scorecard.cli")
+
+
+# ================================================================================
+# Job Loading
+# ================================================================================
+def load_jobs(path):
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    defaults = spec.get("defaults", {})
+    jobs = []
+    for i, job in enumerate(spec.get("jobs", [])):
+        merged = {**defaults, **job}
+        merged.setdefault("name", f"job_{i + 1}")
+        merged.setdefault("title", "Game Scorecard")
+        merged.setdefault("subtitle", "A detailed analysis")
+        merged.setdefault("style", next(iter(STYLE_PRESETS)))
+        merged.setdefault("regions", ["Brazil"])
+        if merged["style"] not in STYLE_PRESETS:
+            raise ValueError(f"Job '{merged['name']}': unknown style preset '{merged['style']}'. Choose from {list(STYLE_PRESETS)}.")
+        if not merged.get("metrics"):
+            raise ValueError(f"Job '{merged['name']}': 'metrics' must be a non-empty list.")
+        if not merged.get("moments"):
+            raise ValueError(f"Job '{merged['name']}': 'moments' must contain at least one moment.")
+        merged["ai_categories"] = _validated_categories(merged["name"], merged.get("ai_categories"))
+        jobs.append(merged)
+    return jobs
+
+
+def _validated_categories(job_name, ai_categories):
+    """Supplied categories with their case normalized to VALID_CATEGORIES; anything else is an error."""
+    if not ai_categories:
+        return {}
+    if not isinstance(ai_categories, dict):
+        raise ValueError(f"Job '{job_name}': 'ai_categories' must map metric names to categories.")
+    canonical = {category.casefold(): category for category in VALID_CATEGORIES}
+    validated = {}
+    for metric, category in ai_categories.items():
+        validated[metric] = canonical.get(str(category).strip().casefold())
+        if validated[metric] is None:
+            raise ValueError(f"Job '{job_name}': unknown category '{category}' for metric '{metric}'. Choose from {list(VALID_CATEGORIES)}.")
+    return validated
+
+
+def safe_filename(text):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(text)).strip("_") or "output"
+
+
+# ================================================================================
+# Pipeline
+# ================================================================================
+def build_moments(job, api_key):
+    """Runs benchmark calculation and scorecard generation for a job; returns (moments, benchmark_df)."""
+    historical_inputs = {
+        metric: {
+            "historical_df": pd.DataFrame(data.get("events", []), columns=["Event Name", "Baseline (7-day)", "Actual (7-day)"]),
+            "three_month_avg": data.get("three_month_avg", 0.0),
+        }
+        for metric, data in (job.get("historical_data") or {}).items()
+    }
+    benchmark_df, proposed_benchmarks, avg_actuals = pd.DataFrame(), {}, {}
+    if historical_inputs:
+        benchmark_df, proposed_benchmarks, avg_actuals = calculate_all_benchmarks(historical_inputs)
+
+    sheets_dict = process_scorecard_data({
+        "openai_api_key": api_key,
+        "metrics": job["metrics"],
+        "ai_categories": job.get("ai_categories"),
+        "proposed_benchmarks": proposed_benchmarks,
+        "avg_actuals": avg_actuals,
+    })
+    scorecard_df = next(iter(sheets_dict.values()))
+    moments = {name: fill_moment_scorecard(scorecard_df, values or {}) for name, values in job["moments"].items()}
+    return moments, benchmark_df
+
+
+def run_task(job, out_dir, api_key, trace=False):
+    """
+    Builds a job's workbook and one deck per region. Runs inside a worker process.
+    With trace, a per-stage timing report is written next to the outputs as trace.json.
+    """
+    job_dir = os.path.join(out_dir, safe_filename(job["name"]))
+    os.makedirs(job_dir, exist_ok=True)
+    if not trace:
+        return _run_job(job, job_dir, api_key)
+    with tracing.collect() as report:
+        outputs, elapsed = _run_job(job, job_dir, api_key)
+    trace_path = os.path.join(job_dir, "trace.json")
+    tracing.write_report(report, trace_path)
+    return outputs + [trace_path], elapsed
+
+
+def _run_job(job, job_dir, api_key):
+    started = time.perf_counter()
+    moments, benchmark_df = build_moments(job, api_key)
+
+    outputs = []
+    sheets = dict(moments)
+    if not benchmark_df.empty:
+        sheets["Benchmark Summary"] = benchmark_df
+    xlsx_path = os.path.join(job_dir, f"{safe_filename(job['name'])}.xlsx")
+    write_excel_stream(sheets.items(), xlsx_path, style_guide=STYLE_PRESETS[job["style"]])
+    outputs.append(xlsx_path)
+
+    decks = create_region_presentations(
+        title=job["title"],
+        subtitle=job["subtitle"],
+        scorecard_moments=list(moments),
+        sheets_dict=moments,
+        style_guide=STYLE_PRESETS[job["style"]],
+        regions=job["regions"],
+        openai_api_key=api_key,
+    )
+    for region, ppt_buffer in decks.items():
+        pptx_path = os.path.join(job_dir, f"{safe_filename(job['name'])}_{safe_filename(region)}.pptx")
+        with open(pptx_path, "wb") as f:
+            f.write(ppt_buffer.getvalue())
+        outputs.append(pptx_path)
+    return outputs, time.perf_counter() - started
+
+
+def run_batch(jobs, out_dir, api_key=None, workers=None, trace=False):
+    """Fans the jobs out over a process pool. Returns (outputs, failures)."""
+    outputs, failures = [], []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(run_task, job, out_dir, api_key, trace): job["name"] for job in jobs}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                paths, elapsed = future.result()
+            except Exception as e:
+                logger.error("Job '%s' failed: %s", name, e)
+                failures.append((name, str(e)))
+                continue
+            logger.info("Job '%s' (%d files) finished in %.1fs", name, len(paths), elapsed)
+            outputs.extend(paths)
+    return outputs, failures
+
+
+# ================================================================================
+# Entry Point
+# ================================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build scorecard decks and workbooks from a job file, without the Streamlit UI.")
+    parser.add_argument("job_file", help="Path to the JSON job file.")
+    parser.add_argument("--out", default="output", help="Directory to write .pptx/.xlsx files into (default: output).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of CPUs).")
+    parser.add_argument("--api-key-env", default="OPENAI_API_KEY", help="Environment variable holding the OpenAI API key.")
+    parser.add_argument("--trace", action="store_true", help="Write a per-stage timing report (trace.json) for every job.")
+    parser.add_argument("--image-rate-limit", metavar="PER_MINUTE[,BURST]", default=None,
+                        help="Image generations per minute across each worker's jobs (default: SCORECARD_RATE_LIMIT_IMAGES or 60). "
+                             "Match your OpenAI account's images-per-minute limit.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress messages from the pipeline.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    logger.setLevel(logging.INFO)
+
+    if args.image_rate_limit:
+        try:
+            rate, burst = http_client.parse_rate_limit(args.image_rate_limit)
+        except ValueError as e:
+            parser.error(f"--image-rate-limit: {e}")
+        # Forked workers inherit the bucket settings; spawned ones read the environment variable
+        http_client.set_rate_limit("api.openai.com/v1/images/generations", rate, burst)
+        os.environ[http_client.RATE_LIMIT_ENV["api.openai.com/v1/images/generations"]] = args.image_rate_limit
+
+    jobs = load_jobs(args.job_file)
+    outputs, failures = run_batch(jobs, args.out, api_key=os.environ.get(args.api_key_env), workers=args.workers, trace=args.trace)
+    for path in sorted(outputs):
+        print(path)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
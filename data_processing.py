@@ -1,64 +1,42 @@
-import streamlit as st
 import pandas as pd
 import numpy as np
-import requests
-import json
 from typing import Dict, List
 
-# ================================================================================
-# AI Metric Categorization using OpenAI API
-# ================================================================================
-def get_ai_metric_categories(metrics: list, api_key: str) -> dict:
-    """Uses the OpenAI API to categorize a list of metrics."""
-    if not api_key:
-        st.error("OpenAI API key is required for AI categorization.")
-        return {}
-    if not metrics:
-        return {}
-        
-    st.info("Asking AI to categorize metrics...")
-    prompt = f"""
-    You are an expert marketing analyst. Your task is to categorize a list of metrics into one of three categories: 'Reach', 'Depth', or 'Action'.
-
-    Here are the definitions:
-    - **Reach**: Did we hit sufficient scale?
-    - **Depth**: Did we meaningfully engage?
-    - **Action**: Did they take action?
-
-    Here is the list of metrics to categorize:
-    {json.dumps(metrics)}
-
-    Respond *only* with a single JSON object where keys are the metrics and values are their category. The category must be one of "Reach", "Depth", or "Action".
-    """
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    payload = {"model": "gpt-4-turbo", "messages": [{"role": "user", "content": prompt}], "response_format": {"type": "json_object"}, "temperature": 0.1}
-    
-    try:
-        api_url = "https://api.openai.com/v1/chat/completions"
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        return json.loads(response.json()['choices'][0]['message']['content'])
-    except Exception as e:
-        st.error(f"AI categorization failed: {e}")
-        return {}
+import feedback
+import tracing
+# Re-exported here because the scorecard pipeline has always imported categorization from this module
+from categorization import get_ai_metric_categories, normalize_metric_name, VALID_CATEGORIES
+from scorecard_schema import SCORECARD_COLUMNS, to_typed_scorecard, percent_difference
 
 # ================================================================================
 # Scorecard Generation
 # ================================================================================
+@tracing.traced("scorecard.process")
 def process_scorecard_data(config: dict) -> dict:
     """
     Generates the initial scorecard structure, now with AI-driven categories,
     and pre-fills benchmarks if they were calculated.
+    Precomputed categories can be supplied via config['ai_categories'] and a
+    CategorizationService via config['categorizer'] to avoid repeat API calls.
     """
     sheets_dict = {}
     all_metrics = list(set(config.get('metrics', [])))
     if not all_metrics:
-        st.warning("No metrics selected.")
+        feedback.warning("No metrics selected.")
         return {}
     
-    ai_categories = get_ai_metric_categories(all_metrics, config.get('openai_api_key'))
+    # Categories computed in Step 1 can be passed in, so only metrics without one
+    # go through the (session-memoized) categorizer or the API.
+    ai_categories = dict(config.get('ai_categories') or {})
+    uncategorized_metrics = [m for m in all_metrics if m not in ai_categories]
+    if uncategorized_metrics:
+        categorizer = config.get('categorizer')
+        if categorizer is not None:
+            ai_categories.update(categorizer.categorize(uncategorized_metrics))
+        else:
+            ai_categories.update(get_ai_metric_categories(uncategorized_metrics, config.get('openai_api_key')))
     if not ai_categories: 
-        st.warning("Could not get AI categories. Using 'Uncategorized'.")
+        feedback.warning("Could not get AI categories. Using 'Uncategorized'.")
     
     # --- FIXED: Safely handle cases where benchmark data was not generated ---
     # Default to an empty dictionary if the keys are missing or None.
@@ -67,6 +45,8 @@ def process_scorecard_data(config: dict) -> dict:
 
     # Sort metrics based on the desired category order for a clean table layout
     category_order = ["Reach", "Depth", "Action", "Uncategorized"]
+    # Anything outside the known categories (e.g. a hand-written job file) is treated as Uncategorized
+    ai_categories = {m: c if c in category_order else "Uncategorized" for m, c in ai_categories.items()}
     sorted_metrics = sorted(all_metrics, key=lambda x: category_order.index(ai_categories.get(x, "Uncategorized")))
 
     rows_for_event = []
@@ -77,19 +57,45 @@ def process_scorecard_data(config: dict) -> dict:
         row = {"Category": category, "Metric": metric_name, "Actuals": actual_val, "Benchmark": benchmark_val, "% Difference": None}
         rows_for_event.append(row)
     
-    df_event = pd.DataFrame(rows_for_event)
+    df_event = pd.DataFrame(rows_for_event, columns=SCORECARD_COLUMNS)
     if not df_event.empty:
         # This logic correctly blanks out repeated category names for a clean look
         df_event['category_group'] = (df_event['Category'] != df_event['Category'].shift()).cumsum()
         df_event.loc[df_event.duplicated(subset=['category_group']), 'Category'] = ''
         df_event = df_event.drop(columns=['category_group'])
         
-    sheets_dict["Final Scorecard"] = df_event
+    sheets_dict["Final Scorecard"] = to_typed_scorecard(df_event)
     return sheets_dict
 
+def compute_percent_difference(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the scorecard in the typed schema with '% Difference' filled in as a numeric
+    ratio. Columns that are already typed are not reparsed.
+    """
+    df = to_typed_scorecard(df)
+    df['% Difference'] = percent_difference(df['Actuals'], df['Benchmark'])
+    return df
+
+def fill_moment_scorecard(scorecard_df: pd.DataFrame, moment_values: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Returns a copy of the scorecard with a moment's values filled in. `moment_values` maps
+    each metric to {"Actuals": ..., "Benchmark": ...} (either key may be omitted), or
+    directly to its actual value.
+    """
+    df = scorecard_df.copy()
+    for metric, values in moment_values.items():
+        if not isinstance(values, dict):
+            values = {"Actuals": values}
+        mask = df['Metric'] == metric
+        for column in ("Actuals", "Benchmark"):
+            if values.get(column) is not None:
+                df.loc[mask, column] = values[column]
+    return compute_percent_difference(df)
+
 # ================================================================================
 # Benchmark Calculation
 # ================================================================================
+@tracing.traced("benchmarks.calculate")
 def calculate_all_benchmarks(historical_inputs: Dict[str, Dict]) -> (pd.DataFrame, Dict, Dict):
     """
     Takes a dictionary where keys are metrics and values contain their historical data
@@ -131,7 +137,53 @@ def calculate_all_benchmarks(historical_inputs: Dict[str, Dict]) -> (pd.DataFram
         avg_actuals_dict[metric] = round(avg_actual_historical, 2)
     
     if not summary_rows:
-        st.warning("No valid data entered to calculate benchmarks.")
+        feedback.warning("No valid data entered to calculate benchmarks.")
         return pd.DataFrame(), {}, {}
         
     return pd.DataFrame(summary_rows), proposed_benchmarks_dict, avg_actuals_dict
+
+@tracing.traced("benchmarks.calculate_long")
+def calculate_benchmarks_long(historical_df: pd.DataFrame, three_month_avgs: pd.Series,
+                              metric_col: str = "Metric", baseline_col: str = "Baseline (7-day)",
+                              actual_col: str = "Actual (7-day)") -> (pd.DataFrame, Dict, Dict):
+    """
+    Vectorized counterpart of calculate_all_benchmarks for one long-format frame with a
+    row per (metric, event). `three_month_avgs` is indexed by metric; missing averages
+    count as 0. Every metric is computed in a single groupby pass and the inputs are
+    left untouched. Returns the same (summary_df, proposed_benchmarks, avg_actuals).
+    """
+    baselines = pd.to_numeric(historical_df[baseline_col], errors='coerce').to_numpy(dtype=float)
+    actuals = pd.to_numeric(historical_df[actual_col], errors='coerce').to_numpy(dtype=float)
+    valid = ~(np.isnan(baselines) | np.isnan(actuals))
+    baselines, actuals = baselines[valid], actuals[valid]
+
+    uplifts = np.zeros_like(actuals)
+    np.divide((actuals - baselines) * 100, baselines, out=uplifts, where=baselines != 0)
+
+    grouped = pd.DataFrame({
+        "metric": historical_df[metric_col].to_numpy()[valid],
+        "actual": actuals,
+        "uplift": uplifts,
+    }).groupby("metric", sort=False).mean()
+
+    if grouped.empty:
+        feedback.warning("No valid data entered to calculate benchmarks.")
+        return pd.DataFrame(), {}, {}
+
+    three_month = pd.to_numeric(three_month_avgs, errors='coerce').reindex(grouped.index).fillna(0.0).to_numpy(dtype=float)
+    avg_actual = grouped["actual"].to_numpy()
+    avg_uplift = grouped["uplift"].to_numpy()
+    baseline_method = three_month * (1 + avg_uplift / 100)
+    # The median of two values is their mean
+    proposed = (avg_actual + baseline_method) / 2
+
+    summary_df = pd.DataFrame({
+        "Metric":                         grouped.index.to_numpy(),
+        "Avg. Actuals (Historical)":      np.round(avg_actual, 2),
+        "Baseline Method":                np.round(baseline_method, 2),
+        "Baseline Uplift Expect. (%)":    [f"{u:.2f}%" for u in avg_uplift],
+        "Proposed Benchmark":             np.round(proposed, 2),
+    })
+    proposed_benchmarks_dict = dict(zip(summary_df["Metric"], summary_df["Proposed Benchmark"].tolist()))
+    avg_actuals_dict = dict(zip(summary_df["Metric"], summary_df["Avg. Actuals (Historical)"].tolist()))
+    return summary_df, proposed_benchmarks_dict, avg_actuals_dict
@@ -1,12 +1,102 @@
 import pandas as pd
+from copy import copy
 from io import BytesIO
 
-def create_excel_workbook(sheets_dict):
-    """Creates a styled Excel workbook and returns it as a BytesIO buffer."""
+import tracing
+
+PERCENT_NUMBER_FORMAT = "0.0%"
+
+@tracing.traced("excel.workbook")
+def create_excel_workbook(sheets_dict, style_guide=None, streaming=False):
+    """
+    Creates a styled Excel workbook and returns it as a BytesIO buffer.
+    With streaming=True (or a style_guide) the rows go through write_excel_stream instead of
+    building the whole workbook in memory with pd.ExcelWriter.
+    """
     buffer = BytesIO()
+    if streaming or style_guide is not None:
+        write_excel_stream(sheets_dict.items(), buffer, style_guide=style_guide)
+        buffer.seek(0)
+        return buffer
     with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
         for sheet_name, df_sheet in sheets_dict.items():
             df_sheet.to_excel(writer, sheet_name=sheet_name[:31], index=False)
             # Future Excel-specific styling can be added here
     buffer.seek(0)
     return buffer
+
+# ================================================================================
+# Streaming (write-only) Export
+# ================================================================================
+def _excel_styles(style_guide):
+    """Builds the shared openpyxl style objects once; every cell reuses them."""
+    from openpyxl.styles import Font, PatternFill, Alignment
+    if style_guide is None:
+        return {"header": {"font": Font(bold=True)}, "body": {}, "percent": {"number_format": PERCENT_NUMBER_FORMAT}, "category": {"font": Font(bold=True)}}
+    colors, fonts = style_guide["colors"], style_guide["fonts"]
+    header_fill = PatternFill("solid", fgColor=str(colors["table_header_bg"]))
+    body_fill = PatternFill("solid", fgColor=str(colors["table_alt_row_bg"]))
+    body_font = Font(name=fonts["body"], color=str(colors["content_body_text"]))
+    return {
+        "header": {"font": Font(name=fonts["heading"], bold=True, color=str(colors["table_header_text"])), "fill": header_fill, "alignment": Alignment(horizontal="center")},
+        "body": {"font": body_font, "fill": body_fill},
+        "percent": {"font": body_font, "fill": body_fill, "number_format": PERCENT_NUMBER_FORMAT},
+        "category": {"font": Font(name=fonts["body"], bold=True, color=str(colors["content_body_text"])), "fill": body_fill, "alignment": Alignment(horizontal="center", vertical="center")},
+    }
+
+def _style_prototype(ws, style):
+    """Registers a style with the workbook once and returns a cell carrying it."""
+    from openpyxl.cell import WriteOnlyCell
+    cell = WriteOnlyCell(ws)
+    for attribute, style_value in style.items():
+        setattr(cell, attribute, style_value)
+    return cell
+
+def _styled_cell(ws, value, prototype):
+    from openpyxl.cell import WriteOnlyCell
+    cell = WriteOnlyCell(ws, value=value)
+    # Copying the registered style array is much cheaper than assigning font/fill per cell
+    cell._style = copy(prototype._style)
+    return cell
+
+def _excel_value(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+@tracing.traced("excel.write_stream")
+def write_excel_stream(sheet_chunks, sink, style_guide=None):
+    """
+    Writes (sheet_name, DataFrame) chunks to an .xlsx file path or file-like object using
+    openpyxl's write-only workbook, so memory stays bounded regardless of the row count.
+    Consecutive or interleaved chunks with the same sheet name are appended to one sheet
+    (the header is written once). Header, body and non-blank 'Category' cells are styled
+    from the style guide (a STYLE_PRESETS entry) as they are written, with no second pass.
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    styles, prototypes = _excel_styles(style_guide), None
+    sheets = {}
+    for sheet_name, df_chunk in sheet_chunks:
+        title = sheet_name[:31]
+        if title not in sheets:
+            ws = wb.create_sheet(title=title)
+            if prototypes is None:
+                prototypes = {name: _style_prototype(ws, style) for name, style in styles.items()}
+            ws.append([_styled_cell(ws, str(col), prototypes["header"]) for col in df_chunk.columns])
+            sheets[title] = ws
+        ws = sheets[title]
+        category_col = df_chunk.columns.get_loc("Category") if "Category" in df_chunk.columns else None
+        # Numeric '% Difference' ratios stay numbers in Excel and are shown with a percent format
+        column_prototypes = [
+            prototypes["percent"] if col == "% Difference" and pd.api.types.is_numeric_dtype(df_chunk[col]) else prototypes["body"]
+            for col in df_chunk.columns
+        ]
+        for row in df_chunk.itertuples(index=False, name=None):
+            cells = [_styled_cell(ws, _excel_value(value), prototype) for value, prototype in zip(row, column_prototypes)]
+            if category_col is not None and isinstance(row[category_col], str) and row[category_col]:
+                cells[category_col] = _styled_cell(ws, _excel_value(row[category_col]), prototypes["category"])
+            ws.append(cells)
+    if not sheets:
+        wb.create_sheet(title="Sheet1")
+    wb.save(sink)
@@ -0,0 +1,98 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# ================================================================================
+# User Feedback (info / warning / error / progress)
+# ================================================================================
+# The pipeline modules report through these functions instead of calling st.*
+# directly, so they also run headless (CLI, worker processes). app.py installs
+# the StreamlitNotifier; everywhere else messages go to the "scorecard" logger.
+logger = logging.getLogger("scorecard")
+
+
+class _LogProgress:
+    def progress(self, value, text=None):
+        if text:
+            logger.info("%s (%.0f%%)", text, value * 100)
+
+    def empty(self):
+        pass
+
+
+class Notifier:
+    """Default notifier: writes everything to the standard logging module."""
+
+    def info(self, message):
+        logger.info(message)
+
+    def warning(self, message):
+        logger.warning(message)
+
+    def error(self, message):
+        logger.error(message)
+
+    def progress(self, value, text=None):
+        handle = _LogProgress()
+        handle.progress(value, text)
+        return handle
+
+
+class StreamlitNotifier(Notifier):
+    """Shows messages and progress bars in the running Streamlit app."""
+
+    def __init__(self):
+        import streamlit as st
+        self.st = st
+
+    def info(self, message):
+        self.st.info(message)
+
+    def warning(self, message):
+        self.st.warning(message)
+
+    def error(self, message):
+        self.st.error(message)
+
+    def progress(self, value, text=None):
+        return self.st.progress(value, text=text)
+
+
+_default_notifier = Notifier()
+_scoped_notifier = ContextVar("scoped_notifier", default=None)
+
+
+def set_notifier(notifier: Notifier):
+    """Replaces the process-wide notifier."""
+    global _default_notifier
+    _default_notifier = notifier
+
+
+@contextmanager
+def notifier_scope(notifier: Notifier):
+    """Uses `notifier` for the current thread/context only, e.g. inside a background job."""
+    token = _scoped_notifier.set(notifier)
+    try:
+        yield notifier
+    finally:
+        _scoped_notifier.reset(token)
+
+
+def get_notifier() -> Notifier:
+    return _scoped_notifier.get() or _default_notifier
+
+
+def info(message):
+    get_notifier().info(message)
+
+
+def warning(message):
+    get_notifier().warning(message)
+
+
+def error(message):
+    get_notifier().error(message)
+
+
+def progress(value, text=None):
+    return get_notifier().progress(value, text)
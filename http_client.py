@@ -0,0 +1,207 @@
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+import tracing
+
+logger = logging.getLogger("scorecard.http")
+
+# ================================================================================
+# Shared HTTP Client
+# ================================================================================
+# One pooled, keep-alive Session is shared by the AI categorization and image
+# paths. Calls that hit a rate limit (429) or a server error (5xx) are retried
+# with exponential backoff and jitter, honouring Retry-After when it is sent.
+POOL_MAXSIZE = 16
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# A read timeout means the server may still be working on (and billing) the request,
+# so by default only these idempotent methods are retried after one.
+RETRY_READ_TIMEOUT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Per-endpoint token buckets as (requests per second, burst size), keyed by host + path.
+# Provider limits depend on the account's usage tier, so each bucket can be set in
+# requests per minute, optionally with a burst size, through an environment variable,
+# e.g. SCORECARD_RATE_LIMIT_IMAGES=150,20. The default image bucket (60/min) keeps a
+# full image pool busy; if an account's limit is lower, the 429s it causes are retried
+# after Retry-After.
+RATE_LIMIT_ENV = {
+    "api.openai.com/v1/chat/completions": "SCORECARD_RATE_LIMIT_CHAT",
+    "api.openai.com/v1/images/generations": "SCORECARD_RATE_LIMIT_IMAGES",
+}
+
+
+def parse_rate_limit(value: str) -> Tuple[float, int]:
+    """'<requests per minute>[,<burst>]' -> (requests per second, burst); ValueError if malformed."""
+    per_minute, _, burst = value.partition(",")
+    rate = float(per_minute) / 60.0
+    capacity = int(burst) if burst.strip() else max(1, int(float(per_minute) // 6))
+    if rate <= 0 or capacity < 1:
+        raise ValueError(f"Rate limit '{value}' must be positive.")
+    return rate, capacity
+
+
+def _rate_limit_from_env(endpoint: str, default: Tuple[float, int]) -> Tuple[float, int]:
+    value = os.environ.get(RATE_LIMIT_ENV.get(endpoint, ""), "").strip()
+    if not value:
+        return default
+    try:
+        return parse_rate_limit(value)
+    except ValueError as e:
+        logger.warning("Ignoring %s=%r (%s); using %s requests/min.", RATE_LIMIT_ENV[endpoint], value, e, default[0] * 60)
+        return default
+
+
+RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "api.openai.com/v1/chat/completions": _rate_limit_from_env("api.openai.com/v1/chat/completions", (5.0, 10)),
+    "api.openai.com/v1/images/generations": _rate_limit_from_env("api.openai.com/v1/images/generations", (1.0, 10)),
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide Session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def mount_adapter(prefix: str, adapter: BaseAdapter):
+    """
+    Routes every request whose URL starts with `prefix` through `adapter` instead of the
+    network, e.g. benchmarks/openai_stub.py for offline runs. Longest prefix wins, as in requests.
+    """
+    get_session().mount(prefix, adapter)
+
+
+class TokenBucket:
+    """A thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def endpoint_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def set_rate_limit(endpoint: str, rate: float, capacity: int):
+    """Overrides (or adds) the token bucket for an endpoint, e.g. to match an account's tier."""
+    with _buckets_lock:
+        RATE_LIMITS[endpoint] = (rate, capacity)
+        _buckets.pop(endpoint, None)
+
+
+def _get_bucket(url: str) -> Optional[TokenBucket]:
+    key = endpoint_key(url)
+    with _buckets_lock:
+        if key not in _buckets and key in RATE_LIMITS:
+            _buckets[key] = TokenBucket(*RATE_LIMITS[key])
+        return _buckets.get(key)
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parses a Retry-After header given either in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_seconds(attempt: int) -> float:
+    # "Full jitter": a random delay up to the exponential cap
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def request(method: str, url: str, max_retries: int = MAX_RETRIES, retry_on_timeout: Optional[bool] = None, **kwargs) -> requests.Response:
+    """
+    Sends a request through the shared Session, rate-limited per endpoint and retried on
+    connection errors, 429 and 5xx. Read timeouts are retried only when retry_on_timeout is
+    true (default: for RETRY_READ_TIMEOUT_METHODS), since a POST such as an image generation may
+    have been processed and billed anyway. The final response is returned as-is, so callers
+    still use raise_for_status(); the last exception is re-raised if every attempt failed.
+    """
+    if retry_on_timeout is None:
+        retry_on_timeout = method.upper() in RETRY_READ_TIMEOUT_METHODS
+    session = get_session()
+    bucket = _get_bucket(url)
+    is_api = urlsplit(url).netloc == "api.openai.com"
+    with tracing.span("http.request", method=method, endpoint=endpoint_key(url)) as span:
+        for attempt in range(max_retries + 1):
+            if bucket is not None:
+                bucket.acquire()
+            if is_api:
+                tracing.count("api.calls")
+            if attempt:
+                tracing.count("http.retries")
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # ConnectTimeout is a ConnectionError: the request never reached the server
+                read_timeout = not isinstance(e, requests.exceptions.ConnectionError)
+                if attempt == max_retries or (read_timeout and not retry_on_timeout):
+                    raise
+                time.sleep(_backoff_seconds(attempt))
+                continue
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                break
+            delay = _retry_after_seconds(response)
+            time.sleep(min(BACKOFF_MAX_SECONDS, delay) if delay is not None else _backoff_seconds(attempt))
+        if tracing.is_enabled():
+            tracing.count("http.bytes_downloaded", len(response.content))
+            span.set(status=response.status_code, attempts=attempt + 1)
+    return response
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
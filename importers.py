@@ -0,0 +1,106 @@
+import hashlib
+import os
+from io import BytesIO
+from typing import Dict, Tuple
+
+import pandas as pd
+
+# ================================================================================
+# Tabular File Uploads (CSV / Parquet / Excel)
+# ================================================================================
+SUPPORTED_UPLOAD_TYPES = ["csv", "parquet", "xlsx", "xls"]
+
+
+def file_hash(data: bytes) -> str:
+    """Content hash used to cache parsed uploads."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_tabular_file(data: bytes, filename: str) -> pd.DataFrame:
+    """Reads an uploaded CSV, Parquet or Excel file (first sheet) into a DataFrame."""
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    if extension == "csv":
+        return pd.read_csv(BytesIO(data))
+    if extension == "parquet":
+        try:
+            return pd.read_parquet(BytesIO(data))
+        except ImportError as e:
+            raise ValueError("Reading Parquet files requires the 'pyarrow' package.") from e
+    if extension in ("xlsx", "xls"):
+        return pd.read_excel(BytesIO(data))
+    raise ValueError(f"Unsupported file type '.{extension}'. Upload one of: {', '.join(SUPPORTED_UPLOAD_TYPES)}.")
+
+
+def _normalize_column(name) -> str:
+    return "".join(ch for ch in str(name).casefold() if ch.isalnum())
+
+
+def rename_columns(df: pd.DataFrame, aliases: Dict[str, Tuple[str, ...]], required: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    Maps loosely named upload columns onto canonical names using `aliases`
+    (canonical name -> accepted spellings, compared ignoring case and punctuation).
+    Raises ValueError if a required column cannot be found.
+    """
+    lookup = {_normalize_column(alias): canonical for canonical, names in aliases.items() for alias in (canonical, *names)}
+    renamed = df.rename(columns={col: lookup[_normalize_column(col)] for col in df.columns if _normalize_column(col) in lookup})
+    missing = [col for col in required if col not in renamed.columns]
+    if missing:
+        raise ValueError(f"The file is missing required column(s): {', '.join(missing)}.")
+    return renamed
+
+
+# ================================================================================
+# Historical Benchmark Data
+# ================================================================================
+HISTORICAL_COLUMN_ALIASES = {
+    "Metric": ("metric name", "kpi"),
+    "Event Name": ("event", "past event"),
+    "Baseline (7-day)": ("baseline", "baseline 7 day", "baseline7d"),
+    "Actual (7-day)": ("actual", "actuals", "actual 7 day", "actual7d"),
+    "3-Month Average": ("three month average", "three month avg", "3 month avg", "3m avg", "three_month_avg"),
+}
+
+
+def parse_historical_upload(data: bytes, filename: str) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Parses a long-format historical file with one row per (metric, past event) and columns
+    Metric, Event Name, Baseline (7-day), Actual (7-day) and optionally 3-Month Average
+    (repeated per row or given once per metric). Returns the frame and a Series of
+    3-month averages indexed by metric, ready for calculate_benchmarks_long.
+    """
+    df = rename_columns(read_tabular_file(data, filename), HISTORICAL_COLUMN_ALIASES, required=("Metric", "Baseline (7-day)", "Actual (7-day)"))
+    df = df.dropna(subset=["Metric"])
+    df["Metric"] = df["Metric"].astype(str).str.strip()
+    if "Event Name" not in df.columns:
+        df["Event Name"] = None
+
+    if "3-Month Average" in df.columns:
+        # First non-empty value per metric
+        three_month_avgs = pd.to_numeric(df["3-Month Average"], errors="coerce").groupby(df["Metric"], sort=False).first()
+    else:
+        three_month_avgs = pd.Series(dtype=float)
+    return df[["Metric", "Event Name", "Baseline (7-day)", "Actual (7-day)"]].reset_index(drop=True), three_month_avgs
+
+
+# ================================================================================
+# Influencer Rosters
+# ================================================================================
+INFLUENCER_COLUMN_ALIASES = {
+    "name": ("handle", "influencer", "creator", "username", "channel"),
+    "follower_count": ("followers", "follower count", "subscribers", "audience", "audience size"),
+    "engagement_rate": ("engagement", "engagement %", "engagement rate %", "er", "er %", "eng rate"),
+}
+
+
+def parse_influencer_roster(data: bytes, filename: str) -> pd.DataFrame:
+    """
+    Parses an uploaded roster with one row per influencer: name, follower count and engagement
+    rate in percent ('3.5' or '3.5%'). Column names are matched loosely (see INFLUENCER_COLUMN_ALIASES).
+    Returns the typed roster used by strategy.influencer_model.
+    """
+    from strategy import to_influencer_frame
+    df = rename_columns(read_tabular_file(data, filename), INFLUENCER_COLUMN_ALIASES, required=("follower_count",))
+    for column in ("follower_count", "engagement_rate"):
+        if column in df.columns and not pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = df[column].astype("string").str.replace(r"[%,\s]", "", regex=True)
+    return to_influencer_frame(df.dropna(how="all"))
@@ -0,0 +1,155 @@
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import feedback
+
+# ================================================================================
+# Background Jobs
+# ================================================================================
+# Long builds (create_presentation) run on a shared thread pool instead of the
+# Streamlit script thread, so a session can keep working while its deck builds
+# and sessions don't queue behind each other. Each job reports through its own
+# notifier (feedback.notifier_scope), which the UI polls.
+JOB_MAX_WORKERS = 4
+# Finished jobs are forgotten after this long (results are normally collected within seconds)
+JOB_RETENTION_SECONDS = 60 * 60
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    """State of one background job; read by the UI, written by the worker thread."""
+
+    def __init__(self, name: str, owner: Optional[str]):
+        self.job_id = uuid.uuid4().hex
+        self.name = name
+        self.owner = owner
+        self.status = QUEUED
+        self.progress = 0.0
+        self.progress_text = None
+        self.messages = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def add_message(self, level: str, message: str):
+        with self._lock:
+            self.messages.append((level, message))
+
+    def set_progress(self, value: float, text: Optional[str] = None):
+        with self._lock:
+            self.progress = max(0.0, min(1.0, float(value)))
+            if text:
+                self.progress_text = text
+
+
+class _JobProgress:
+    def __init__(self, job: Job):
+        self.job = job
+
+    def progress(self, value, text=None):
+        self.job.set_progress(value, text)
+
+    def empty(self):
+        pass
+
+
+class JobNotifier(feedback.Notifier):
+    """Collects a job's messages and progress instead of drawing them (there is no page to draw on)."""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def info(self, message):
+        super().info(message)
+        self.job.add_message("info", message)
+
+    def warning(self, message):
+        super().warning(message)
+        self.job.add_message("warning", message)
+
+    def error(self, message):
+        super().error(message)
+        self.job.add_message("error", message)
+
+    def progress(self, value, text=None):
+        handle = _JobProgress(self.job)
+        handle.progress(value, text)
+        return handle
+
+
+class JobRunner:
+    """Thread pool plus a registry of jobs by id."""
+
+    def __init__(self, max_workers: int = JOB_MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scorecard-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, name: str = "job", owner: Optional[str] = None, **kwargs) -> Job:
+        """Runs func(*args, **kwargs) in the background and returns its Job straight away."""
+        self.prune()
+        job = Job(name, owner)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        job.status = RUNNING
+        try:
+            with feedback.notifier_scope(JobNotifier(job)):
+                job.result = func(*args, **kwargs)
+            job.set_progress(1.0)
+            status = DONE
+        except Exception as e:
+            feedback.logger.error("Background job '%s' failed:\n%s", job.name, traceback.format_exc())
+            job.error = str(e) or type(e).__name__
+            status = FAILED
+        # finished_at first: other threads treat a DONE/FAILED job as complete (see prune)
+        job.finished_at = time.time()
+        job.status = status
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner: Optional[str] = None) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def discard(self, job_id: str):
+        """Forgets a finished job once its result has been collected."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+
+    def prune(self, max_age_seconds: float = JOB_RETENTION_SECONDS):
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            for job_id in [j.job_id for j in self._jobs.values() if j.finished and j.finished_at is not None and j.finished_at < cutoff]:
+                del self._jobs[job_id]
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Returns the process-wide JobRunner (shared by all Streamlit sessions)."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
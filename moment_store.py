@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from io import StringIO
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+# ================================================================================
+# Durable Moment Store
+# ================================================================================
+# Saved scorecard moments live in a local SQLite database instead of in
+# st.session_state, so they survive restarts and don't sit in every session's
+# memory. Sessions keep MomentHandle tuples and load DataFrames on demand.
+DEFAULT_DATA_DIR = os.environ.get(
+    "SCORECARD_DATA_DIR",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "scorecard_generator")
+)
+# Number of recently loaded moment DataFrames kept in memory per process
+LOADED_MOMENTS_CACHE_SIZE = 16
+# Moments are scoped to the browser session unless the user names a workspace.
+# Session workspaces can't be reopened, so their moments are dropped after this long.
+SESSION_WORKSPACE_PREFIX = "session-"
+SESSION_MOMENT_RETENTION_SECONDS = 7 * 24 * 60 * 60
+
+
+class MomentHandle(NamedTuple):
+    """Lightweight reference to a stored moment; this is what session state holds."""
+    moment_id: str
+    name: str
+    row_count: int
+    updated_at: float
+
+
+def session_workspace_id() -> str:
+    """A fresh workspace private to one session (the default)."""
+    return SESSION_WORKSPACE_PREFIX + uuid.uuid4().hex
+
+
+def workspace_id(name: str) -> str:
+    """Workspace for a name the user chose; anyone entering the same name shares its moments."""
+    return hashlib.sha256(" ".join(name.split()).casefold().encode("utf-8")).hexdigest()[:16]
+
+
+def _frame_to_json(df: Optional[pd.DataFrame]) -> Optional[str]:
+    return None if df is None else df.to_json(orient="table", index=False)
+
+
+def _frame_from_json(data: Optional[str]) -> Optional[pd.DataFrame]:
+    return None if data is None else pd.read_json(StringIO(data), orient="table")
+
+
+class MomentStore:
+    """SQLite-backed repository of scorecard moments (rows, benchmark summary and metadata)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DEFAULT_DATA_DIR, "moments.sqlite3")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._loaded = OrderedDict()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS moments ("
+                " moment_id TEXT PRIMARY KEY, workspace TEXT NOT NULL, name TEXT NOT NULL,"
+                " row_count INTEGER NOT NULL, scorecard TEXT NOT NULL, benchmarks TEXT, metadata TEXT,"
+                " created_at REAL NOT NULL, updated_at REAL NOT NULL, UNIQUE (workspace, name))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        with self._lock:
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def save(self, workspace: str, name: str, scorecard_df: pd.DataFrame, benchmark_df: Optional[pd.DataFrame] = None,
+             metadata: Optional[Dict] = None, overwrite: bool = False) -> MomentHandle:
+        """
+        Saves a moment and returns its handle. A moment with the same name in the workspace
+        is only replaced with overwrite=True; otherwise ValueError is raised.
+        """
+        now = time.time()
+        scorecard_json = _frame_to_json(scorecard_df.reset_index(drop=True))
+        benchmarks_json = _frame_to_json(benchmark_df if benchmark_df is not None and not benchmark_df.empty else None)
+        with self._connect() as conn:
+            row = conn.execute("SELECT moment_id, created_at FROM moments WHERE workspace = ? AND name = ?", (workspace, name)).fetchone()
+            if row and not overwrite:
+                raise ValueError(f"A moment named '{name}' already exists in this workspace.")
+            moment_id, created_at = row if row else (uuid.uuid4().hex, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO moments (moment_id, workspace, name, row_count, scorecard, benchmarks, metadata, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (moment_id, workspace, name, len(scorecard_df), scorecard_json, benchmarks_json, json.dumps(metadata or {}, default=str), created_at, now)
+            )
+        return MomentHandle(moment_id, name, len(scorecard_df), now)
+
+    def list(self, workspace: str) -> List[MomentHandle]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT moment_id, name, row_count, updated_at FROM moments WHERE workspace = ? ORDER BY created_at", (workspace,)
+            ).fetchall()
+        return [MomentHandle(*row) for row in rows]
+
+    def load(self, handle: MomentHandle) -> pd.DataFrame:
+        """Loads a moment's scorecard rows. Recently used moments are served from memory."""
+        key = (handle.moment_id, handle.updated_at)
+        with self._lock:
+            if key in self._loaded:
+                self._loaded.move_to_end(key)
+                return self._loaded[key].copy()
+        with self._connect() as conn:
+            row = conn.execute("SELECT scorecard FROM moments WHERE moment_id = ?", (handle.moment_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Moment '{handle.name}' no longer exists.")
+        df = _frame_from_json(row[0])
+        with self._lock:
+            self._loaded[key] = df
+            while len(self._loaded) > LOADED_MOMENTS_CACHE_SIZE:
+                self._loaded.popitem(last=False)
+        return df.copy()
+
+    def load_benchmarks(self, handle: MomentHandle) -> Optional[pd.DataFrame]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT benchmarks FROM moments WHERE moment_id = ?", (handle.moment_id,)).fetchone()
+        return _frame_from_json(row[0]) if row else None
+
+    def load_metadata(self, handle: MomentHandle) -> Dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT metadata FROM moments WHERE moment_id = ?", (handle.moment_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def delete(self, handle: MomentHandle):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM moments WHERE moment_id = ?", (handle.moment_id,))
+        self._forget([handle.moment_id])
+
+    def clear(self, workspace: str):
+        """Deletes every moment in a workspace."""
+        with self._connect() as conn:
+            moment_ids = [row[0] for row in conn.execute("SELECT moment_id FROM moments WHERE workspace = ?", (workspace,))]
+            conn.execute("DELETE FROM moments WHERE workspace = ?", (workspace,))
+        self._forget(moment_ids)
+
+    def prune_sessions(self, max_age_seconds: float = SESSION_MOMENT_RETENTION_SECONDS):
+        """Drops moments of session workspaces not updated within max_age_seconds."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM moments WHERE workspace LIKE ? AND updated_at < ?",
+                         (SESSION_WORKSPACE_PREFIX + "%", time.time() - max_age_seconds))
+
+    def _forget(self, moment_ids):
+        moment_ids = set(moment_ids)
+        with self._lock:
+            for key in [k for k in self._loaded if k[0] in moment_ids]:
+                del self._loaded[key]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_moment_store() -> MomentStore:
+    """Returns the process-wide MomentStore (shared by all Streamlit sessions)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MomentStore()
+            _store.prune_sessions()
+        return _store
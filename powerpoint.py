@@ -1,101 +1,434 @@
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from io import BytesIO
-import matplotlib.pyplot as plt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+import threading
 import requests 
-import streamlit as st
 import pandas as pd
+import numpy as np
+from xml.sax.saxutils import escape
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+
+import feedback
+import http_client
+import tracing
+from cache import DiskCache, content_key
+from scorecard_schema import format_scorecard_for_display
+
+# Upper bound on simultaneous DALL·E requests when images are generated concurrently.
+# Throughput is also capped by http_client's image token bucket (default 60/min, set with
+# SCORECARD_RATE_LIMIT_IMAGES or the CLI's --image-rate-limit): more workers only help
+# while that bucket has tokens to spare.
+IMAGE_MAX_WORKERS = 6
+IMAGE_MODEL = "dall-e-3"
+IMAGE_SIZE = "1792x1024"
+# Generated images are kept on disk and evicted least-recently-used past this size
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# "shapes" draws the timeline natively; "matplotlib" embeds a (cached) rendered chart
+TIMELINE_RENDERER = "shapes"
+TIMELINE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Scorecard table placement; tables taller than the space below TABLE_TOP continue on the next slide
+TABLE_LEFT, TABLE_TOP, TABLE_WIDTH = Inches(0.5), Inches(1.2), Inches(15)
+TABLE_BOTTOM_MARGIN = Inches(0.5)
+TABLE_CELL_MARGIN = Inches(0.05)
+# Rendered table/timeline slides kept by a DeckBuildCache for incremental rebuilds
+DECK_CACHE_MAX_SLIDES = 512
+TITLE_PROMPT_DETAIL = "a cinematic football stadium"
+MOMENT_PROMPT_DETAIL = "football culture"
 
 # ================================================================================
 # Main Presentation Creation Function
 # ================================================================================
-def create_presentation(title, subtitle, scorecard_moments, sheets_dict, style_guide, region_prompt, openai_api_key):
-    """Creates and returns a PowerPoint presentation as a BytesIO buffer."""
+@tracing.traced("deck.create_presentation")
+def create_presentation(title, subtitle, scorecard_moments, sheets_dict, style_guide, region_prompt, openai_api_key,
+                        concurrent_images=True, max_image_workers=IMAGE_MAX_WORKERS, image_variants=1, use_image_cache=True,
+                        max_rows_per_slide=None, timeline_renderer=TIMELINE_RENDERER, build_cache=None):
+    """
+    Creates and returns a PowerPoint presentation as a BytesIO buffer.
+    Every background image is requested up front and the slides pick up the results in
+    order as they are built; with concurrent_images the requests run on a bounded thread pool.
+    Slides with the same prompt share an image: moment slides cycle through `image_variants`
+    variants per prompt, and every variant is served from the on-disk image cache once generated.
+    Long scorecards are paginated across continuation slides (see compute_table_layout).
+    With a build_cache (see DeckBuildCache) the build is incremental: table and timeline slides
+    whose fingerprints are unchanged are copied from the previous build instead of re-rendered,
+    and an entirely unchanged deck is returned without building anything.
+    """
+    deck_key = deck_fingerprint(title, subtitle, scorecard_moments, sheets_dict, style_guide, region_prompt, openai_api_key,
+                                image_variants, max_rows_per_slide, timeline_renderer) if build_cache is not None else None
+    if build_cache is not None:
+        deck_bytes = build_cache.get_deck(deck_key)
+        if deck_bytes is not None:
+            return BytesIO(deck_bytes)
+
+    futures, executor = [None] * (len(scorecard_moments) + 1), None
+    if openai_api_key:
+        slide_images = slide_image_requests(region_prompt, len(scorecard_moments), image_variants)
+        workers = max(1, min(max_image_workers, len(set(slide_images)))) if concurrent_images else 1
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = submit_image_requests(executor, slide_images, openai_api_key, use_image_cache)
+
+    try:
+        prs = build_deck(title, subtitle, scorecard_moments, sheets_dict, style_guide, region_prompt, openai_api_key, futures[0], futures[1:],
+                         max_rows_per_slide=max_rows_per_slide, timeline_renderer=timeline_renderer, build_cache=build_cache)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return save_deck(prs, build_cache, deck_key, futures)
+
+@tracing.traced("deck.create_region_presentations")
+def create_region_presentations(title, subtitle, scorecard_moments, sheets_dict, style_guide, regions, openai_api_key,
+                                max_image_workers=IMAGE_MAX_WORKERS, image_variants=1, use_image_cache=True,
+                                max_rows_per_slide=None, timeline_renderer=TIMELINE_RENDERER, build_cache=None):
+    """
+    Builds one deck per region in a single call and returns {region: BytesIO}.
+    The background images of every region are requested up front on one shared thread pool
+    (still subject to the image rate limit in http_client.RATE_LIMITS, which is process-wide);
+    the region-independent slides (tables, native timeline) are rendered for the first region
+    and copied into the others through a DeckBuildCache.
+    """
+    regions = list(dict.fromkeys(regions))
+    build_cache = build_cache if build_cache is not None else DeckBuildCache(max_slides=None)
+    region_futures = {region: [None] * (len(scorecard_moments) + 1) for region in regions}
+    executor = None
+    if openai_api_key and regions:
+        requests_by_region = {region: slide_image_requests(region, len(scorecard_moments), image_variants) for region in regions}
+        unique_images = {image for images in requests_by_region.values() for image in images}
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_image_workers, len(unique_images))))
+        futures_by_image = {}
+        for region, images in requests_by_region.items():
+            region_futures[region] = submit_image_requests(executor, images, openai_api_key, use_image_cache, futures_by_image)
+
+    decks = {}
+    try:
+        for region in regions:
+            deck_key = deck_fingerprint(title, subtitle, scorecard_moments, sheets_dict, style_guide, region, openai_api_key,
+                                        image_variants, max_rows_per_slide, timeline_renderer)
+            deck_bytes = build_cache.get_deck(deck_key)
+            if deck_bytes is not None:
+                decks[region] = BytesIO(deck_bytes)
+                continue
+            futures = region_futures[region]
+            prs = build_deck(title, subtitle, scorecard_moments, sheets_dict, style_guide, region, openai_api_key, futures[0], futures[1:],
+                             max_rows_per_slide=max_rows_per_slide, timeline_renderer=timeline_renderer, build_cache=build_cache)
+            decks[region] = save_deck(prs, build_cache, deck_key, futures)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return decks
+
+def build_deck(title, subtitle, scorecard_moments, sheets_dict, style_guide, region_prompt, openai_api_key, title_future, moment_futures,
+               max_rows_per_slide=None, timeline_renderer=TIMELINE_RENDERER, build_cache=None):
+    """Adds every slide of one deck to a new Presentation and returns it (see create_presentation)."""
     prs = Presentation()
     prs.slide_width = Inches(16)
     prs.slide_height = Inches(9)
 
-    add_title_slide(prs, title, subtitle, style_guide, region_prompt, openai_api_key)
-    add_timeline_slide(prs, scorecard_moments, style_guide)
+    table_layout = compute_table_layout(prs, style_guide, max_rows_per_slide)
+    style_key = style_fingerprint(style_guide) if build_cache is not None else None
+    add_title_slide(prs, title, subtitle, style_guide, region_prompt, openai_api_key, image_future=title_future)
+    if timeline_renderer == "shapes":
+        timeline_key = content_key("timeline", style_key, *scorecard_moments) if build_cache is not None else None
+        render_cached_slides(prs, build_cache, timeline_key, lambda: add_timeline_slide(prs, scorecard_moments, style_guide, renderer=timeline_renderer))
+    else:
+        # The matplotlib chart is a picture part, so it is reused through the PNG cache instead
+        add_timeline_slide(prs, scorecard_moments, style_guide, renderer=timeline_renderer)
 
     total_moments = len(scorecard_moments)
     if total_moments > 0:
         progress_text = "Generating AI background images... (This can take a moment)"
-        image_progress_bar = st.progress(0, text=progress_text)
+        image_progress_bar = feedback.progress(0, text=progress_text)
 
         for i, moment in enumerate(scorecard_moments):
             image_progress_bar.progress((i + 1) / total_moments, text=f"Generating image for '{moment}'...")
-            add_moment_title_slide(prs, f"SCORECARD:\n{moment.upper()}", style_guide, region_prompt, openai_api_key)
+            add_moment_title_slide(prs, f"SCORECARD:\n{moment.upper()}", style_guide, region_prompt, openai_api_key, image_future=moment_futures[i])
             for sheet_name, scorecard_df in sheets_dict.items():
                 if "benchmark" not in sheet_name.lower():
-                    add_df_to_slide(prs, scorecard_df, f"{moment.upper()} METRICS: {sheet_name}", style_guide)
+                    slide_title = f"{moment.upper()} METRICS: {sheet_name}"
+                    table_key = content_key("table", style_key, slide_title, frame_fingerprint(scorecard_df), *table_layout.values()) if build_cache is not None else None
+                    render_cached_slides(prs, build_cache, table_key,
+                                         lambda df=scorecard_df, t=slide_title: add_df_to_slide(prs, df, t, style_guide, layout=table_layout))
         
         image_progress_bar.empty()
+    return prs
 
+def save_deck(prs, build_cache, deck_key, image_futures):
+    """Saves the deck to a BytesIO buffer and, if every image came through, remembers it in build_cache."""
     ppt_buffer = BytesIO()
-    prs.save(ppt_buffer)
+    with tracing.span("deck.save", slides=len(prs.slides)):
+        prs.save(ppt_buffer)
     ppt_buffer.seek(0)
+    # Decks with a failed image (solid fallback) are not remembered, so the next build retries
+    images_ok = all(f.done() and not f.cancelled() and f.exception() is None for f in image_futures if f is not None)
+    if build_cache is not None and images_ok:
+        build_cache.set_deck(deck_key, ppt_buffer.getvalue())
     return ppt_buffer
 
+# ================================================================================
+# Incremental Rebuilds
+# ================================================================================
+def style_fingerprint(style_guide):
+    """Content key of every color, font and font size in a style preset."""
+    return content_key(*(f"{section}.{name}={value}" for section in sorted(style_guide) for name, value in sorted(style_guide[section].items())))
+
+def deck_fingerprint(title, subtitle, scorecard_moments, sheets_dict, style_guide, region, openai_api_key,
+                     image_variants=1, max_rows_per_slide=None, timeline_renderer=TIMELINE_RENDERER):
+    """Content key of everything a deck is built from; equal keys give identical decks."""
+    return content_key("deck", title, subtitle, region, style_fingerprint(style_guide), bool(openai_api_key), image_variants,
+                       max_rows_per_slide, timeline_renderer, *scorecard_moments,
+                       *(f"{name}={frame_fingerprint(df)}" for name, df in sheets_dict.items()))
+
+def frame_fingerprint(df):
+    """Content key of a DataFrame's columns, dtypes and values (row order included, index ignored)."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return content_key(*map(str, df.columns), *map(str, df.dtypes), row_hashes.tobytes().hex())
+
+class DeckBuildCache:
+    """
+    In-memory store of slides rendered by earlier create_presentation calls, keyed by
+    fingerprints of their inputs (moment data, style preset, titles). Keep one per session
+    and pass it to every build. Only slides without related parts (tables, native timeline)
+    are kept as XML; background images are reused through the on-disk image cache.
+    max_slides=None keeps every slide (used for the lifetime of one multi-region build).
+    """
+
+    def __init__(self, max_slides=DECK_CACHE_MAX_SLIDES):
+        self.max_slides = max_slides
+        self._slides = OrderedDict()
+        self._slide_count = 0
+        self._deck = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            elements = self._slides.get(key)
+            if elements is None:
+                self.misses += 1
+                tracing.count("cache.slides.misses")
+                return None
+            self._slides.move_to_end(key)
+            self.hits += 1
+            tracing.count("cache.slides.hits")
+            return elements
+
+    def put(self, key, elements):
+        with self._lock:
+            if key in self._slides:
+                self._slide_count -= len(self._slides.pop(key))
+            self._slides[key] = elements
+            self._slide_count += len(elements)
+            while self.max_slides is not None and self._slide_count > self.max_slides and len(self._slides) > 1:
+                self._slide_count -= len(self._slides.popitem(last=False)[1])
+
+    def get_deck(self, key):
+        """Returns the saved .pptx bytes if the last complete build had the same deck key."""
+        with self._lock:
+            return self._deck[1] if self._deck is not None and self._deck[0] == key else None
+
+    def set_deck(self, key, data):
+        with self._lock:
+            self._deck = (key, data)
+
+    def clear(self):
+        with self._lock:
+            self._slides.clear(); self._slide_count = 0; self._deck = None
+
+def render_cached_slides(prs, build_cache, key, render):
+    """
+    Calls render(), which appends slides to prs, and remembers their XML under key; if
+    build_cache already has slides for key they are copied in instead. render() must only
+    add slides with no image or other related parts.
+    """
+    if build_cache is None:
+        render()
+        return
+    cached = build_cache.get(key)
+    if cached is not None:
+        for c_sld in cached:
+            slide = prs.slides.add_slide(prs.slide_layouts[5])
+            slide._element.replace(slide._element.cSld, deepcopy(c_sld))
+        return
+    first_new = len(prs.slides)
+    render()
+    build_cache.put(key, [deepcopy(prs.slides[i]._element.cSld) for i in range(first_new, len(prs.slides))])
+
 # ================================================================================
 # AI Background Image Generation
 # ================================================================================
-def generate_and_add_background_image(slide, region, style_guide, api_key, slide_width, slide_height, prompt_detail="football culture"):
-    prompt = f"Dark, gritty, artistic representation of {prompt_detail} in {region}, cinematic, ultra-realistic photo, dramatic lighting, epic style"
-    if not api_key:
-        st.warning("OpenAI API key is missing. Using a solid background.")
+def build_image_prompt(region, prompt_detail=MOMENT_PROMPT_DETAIL):
+    return f"Dark, gritty, artistic representation of {prompt_detail} in {region}, cinematic, ultra-realistic photo, dramatic lighting, epic style"
+
+def slide_image_requests(region, moment_count, image_variants=1):
+    """(prompt, variant) for the title slide followed by one per moment slide."""
+    image_variants = max(1, image_variants)
+    slide_images = [(build_image_prompt(region, TITLE_PROMPT_DETAIL), 0)]
+    slide_images += [(build_image_prompt(region, MOMENT_PROMPT_DETAIL), i % image_variants) for i in range(moment_count)]
+    return slide_images
+
+def submit_image_requests(executor, slide_images, api_key, use_cache=True, futures_by_image=None):
+    """Submits each distinct image once and returns one future per slide (shared by slides with the same image)."""
+    futures_by_image = {} if futures_by_image is None else futures_by_image
+    for prompt, variant in dict.fromkeys(slide_images):
+        if (prompt, variant) not in futures_by_image:
+            futures_by_image[(prompt, variant)] = executor.submit(get_background_image, prompt, api_key, variant=variant, use_cache=use_cache)
+    return [futures_by_image[image] for image in slide_images]
+
+_image_cache = None
+
+def get_image_cache() -> DiskCache:
+    """Returns the shared on-disk image cache, creating it on first use."""
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = DiskCache("background_images", max_bytes=IMAGE_CACHE_MAX_BYTES)
+    return _image_cache
+
+def fetch_background_image(prompt, api_key):
+    """Requests one DALL·E image and downloads it. Returns the raw image bytes. Safe to call from worker threads."""
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    payload = {"model": IMAGE_MODEL, "prompt": prompt, "n": 1, "size": IMAGE_SIZE, "response_format": "url"}
+    api_url = "https://api.openai.com/v1/images/generations"
+    with tracing.span("image.generate"):
+        response = http_client.post(api_url, headers=headers, json=payload, timeout=45)
+        response.raise_for_status()
+        image_url = response.json()['data'][0]['url']
+    with tracing.span("image.download"):
+        image_response = http_client.get(image_url, timeout=15); image_response.raise_for_status()
+    return image_response.content
+
+def get_background_image(prompt, api_key, variant=0, use_cache=True):
+    """
+    Returns image bytes for the prompt, generating them only if this (prompt, size, model, variant)
+    is not cached yet. Different variant numbers give distinct images for the same prompt.
+    """
+    if not use_cache:
+        return fetch_background_image(prompt, api_key)
+    key = content_key(IMAGE_MODEL, IMAGE_SIZE, prompt, variant)
+    cache = get_image_cache()
+    image_bytes = cache.get(key)
+    if image_bytes is None:
+        tracing.count("cache.images.misses")
+        image_bytes = fetch_background_image(prompt, api_key)
+        cache.set(key, image_bytes)
+    else:
+        tracing.count("cache.images.hits")
+    return image_bytes
+
+def place_background_image(slide, image_bytes, slide_width, slide_height):
+    """Adds the image full-bleed and moves it behind every other shape on the slide."""
+    pic = slide.shapes.add_picture(BytesIO(image_bytes), Inches(0), Inches(0), width=slide_width, height=slide_height)
+    slide.shapes._spTree.remove(pic._element)
+    slide.shapes._spTree.insert(2, pic._element)
+
+def generate_and_add_background_image(slide, region, style_guide, api_key, slide_width, slide_height, prompt_detail=MOMENT_PROMPT_DETAIL, image_future=None):
+    """
+    Adds an AI background to the slide, falling back to a solid fill on failure.
+    If image_future is given (see create_presentation), its result is used instead of calling the API here.
+    """
+    if image_future is None and not api_key:
+        feedback.warning("OpenAI API key is missing. Using a solid background.")
         slide.background.fill.solid(); slide.background.fill.fore_color.rgb = style_guide["colors"]["title_slide_bg"]
         return
     try:
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        payload = {"model": "dall-e-3", "prompt": prompt, "n": 1, "size": "1792x1024", "response_format": "url"}
-        api_url = "https://api.openai.com/v1/images/generations"
-        response = requests.post(api_url, headers=headers, json=payload, timeout=45)
-        response.raise_for_status()
-        image_url = response.json()['data'][0]['url']
-        image_response = requests.get(image_url, timeout=15); image_response.raise_for_status()
-        image_stream = BytesIO(image_response.content)
-        pic = slide.shapes.add_picture(image_stream, Inches(0), Inches(0), width=slide_width, height=slide_height)
-        slide.shapes._spTree.remove(pic._element)
-        slide.shapes._spTree.insert(2, pic._element)
+        # Time spent here is time the slide builder waited on image generation
+        with tracing.span("image.wait"):
+            image_bytes = image_future.result() if image_future is not None else get_background_image(build_image_prompt(region, prompt_detail), api_key)
+        place_background_image(slide, image_bytes, slide_width, slide_height)
     except requests.exceptions.RequestException as e:
-        st.error(f"Image generation for '{region}' failed: {e}. Using a solid background.")
+        feedback.error(f"Image generation for '{region}' failed: {e}. Using a solid background.")
         slide.background.fill.solid(); slide.background.fill.fore_color.rgb = style_guide["colors"]["title_slide_bg"]
 
 # ================================================================================
 # Helper functions for slide creation and styling
 # ================================================================================
-def add_title_slide(prs, title_text, subtitle_text, style_guide, region, api_key):
+@tracing.traced("slide.title")
+def add_title_slide(prs, title_text, subtitle_text, style_guide, region, api_key, image_future=None):
     slide = prs.slides.add_slide(prs.slide_layouts[5])
-    generate_and_add_background_image(slide, region, style_guide, api_key, prs.slide_width, prs.slide_height, prompt_detail="a cinematic football stadium")
+    generate_and_add_background_image(slide, region, style_guide, api_key, prs.slide_width, prs.slide_height, prompt_detail=TITLE_PROMPT_DETAIL, image_future=image_future)
     title_shape = slide.shapes.add_textbox(Inches(1), Inches(3), Inches(14), Inches(2))
     p = title_shape.text_frame.paragraphs[0]; p.text = title_text.upper(); p.font.name = style_guide["fonts"]["heading"]; p.font.bold = True; p.font.size = style_guide["font_sizes"]["title"]; p.font.color.rgb = style_guide["colors"]["title_slide_text"]; p.alignment = PP_ALIGN.CENTER
     subtitle_shape = slide.shapes.add_textbox(Inches(1), Inches(4.5), Inches(14), Inches(1.5))
     p = subtitle_shape.text_frame.paragraphs[0]; p.text = subtitle_text; p.font.name = style_guide["fonts"]["body"]; p.font.size = style_guide["font_sizes"]["subtitle"]; p.font.color.rgb = style_guide["colors"]["title_slide_text"]; p.alignment = PP_ALIGN.CENTER
 
-def add_moment_title_slide(prs, title_text, style_guide, region, api_key):
+@tracing.traced("slide.moment_title")
+def add_moment_title_slide(prs, title_text, style_guide, region, api_key, image_future=None):
     slide = prs.slides.add_slide(prs.slide_layouts[5])
-    generate_and_add_background_image(slide, region, style_guide, api_key, prs.slide_width, prs.slide_height)
+    generate_and_add_background_image(slide, region, style_guide, api_key, prs.slide_width, prs.slide_height, image_future=image_future)
     txBox = slide.shapes.add_textbox(Inches(1), Inches(3.5), Inches(14), Inches(3))
     p = txBox.text_frame.paragraphs[0]; p.text = title_text; p.font.name = style_guide["fonts"]["heading"]; p.font.bold = True; p.font.size = style_guide["font_sizes"]["moment_title"]; p.font.color.rgb = style_guide["colors"]["title_slide_text"]; p.alignment = PP_ALIGN.CENTER
 
-def add_timeline_slide(prs, timeline_moments, style_guide):
+@tracing.traced("slide.timeline")
+def add_timeline_slide(prs, timeline_moments, style_guide, renderer=TIMELINE_RENDERER):
+    """
+    Adds the timeline slide. The default "shapes" renderer draws native, resolution-independent
+    pptx shapes; "matplotlib" embeds the original PNG chart, cached per (moments, style).
+    """
     slide = prs.slides.add_slide(prs.slide_layouts[5])
     slide.background.fill.solid(); slide.background.fill.fore_color.rgb = style_guide["colors"]["content_slide_bg"]
     title_shape = slide.shapes.add_textbox(Inches(1), Inches(0.5), Inches(14), Inches(1.5))
     p = title_shape.text_frame.paragraphs[0]; p.text = "TIMELINE"; p.font.name = style_guide["fonts"]["heading"]; p.font.bold = True; p.font.size = style_guide["font_sizes"]["title"]; p.font.color.rgb = style_guide["colors"]["content_heading_text"]; p.alignment = PP_ALIGN.CENTER
     if not timeline_moments: return
+    if renderer == "matplotlib":
+        plot_stream = BytesIO(render_timeline_png(timeline_moments, style_guide))
+        slide.shapes.add_picture(plot_stream, Inches(1), Inches(3.5), width=Inches(14))
+    else:
+        draw_timeline_shapes(slide, timeline_moments, style_guide)
+
+def draw_timeline_shapes(slide, timeline_moments, style_guide, left=Inches(1), top=Inches(3.5), width=Inches(14), height=Inches(2.5)):
+    """Draws the timeline (axis line, one marker and label per moment) as native shapes."""
+    colors = style_guide["colors"]
+    line_y = top + int(height * 0.4)
+    line_start, line_end = left + int(width * 0.05), left + int(width * 0.95)
+    axis = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, line_start, line_y, line_end, line_y)
+    axis.line.color.rgb = colors["content_body_text"]; axis.line.width = Pt(1.5)
+
+    slot = (line_end - line_start) // len(timeline_moments)
+    marker = Pt(20)
+    for i, moment in enumerate(timeline_moments):
+        center_x = line_start + slot * i + slot // 2
+        dot = slide.shapes.add_shape(MSO_SHAPE.OVAL, center_x - marker // 2, line_y - marker // 2, marker, marker)
+        dot.fill.solid(); dot.fill.fore_color.rgb = colors["content_heading_text"]; dot.line.fill.background()
+        label = slide.shapes.add_textbox(center_x - slot // 2, line_y + Inches(0.3), slot, Inches(1))
+        label.text_frame.word_wrap = True
+        p = label.text_frame.paragraphs[0]; p.text = moment.upper(); p.font.name = style_guide["fonts"]["body"]; p.font.bold = True; p.font.size = Pt(12); p.font.color.rgb = colors["content_body_text"]; p.alignment = PP_ALIGN.CENTER
+
+_timeline_cache = None
+
+def get_timeline_cache() -> DiskCache:
+    global _timeline_cache
+    if _timeline_cache is None:
+        _timeline_cache = DiskCache("timeline_images", max_bytes=TIMELINE_CACHE_MAX_BYTES)
+    return _timeline_cache
+
+@tracing.traced("timeline.matplotlib")
+def render_timeline_png(timeline_moments, style_guide):
+    """Renders the matplotlib timeline chart as PNG bytes; the output depends only on the moments and colors, so it is cached."""
+    colors = style_guide["colors"]
+    key = content_key("timeline", *timeline_moments, colors["content_slide_bg"], colors["content_body_text"], colors["content_heading_text"])
+    cache = get_timeline_cache()
+    png = cache.get(key)
+    if png is not None:
+        return png
+
+    # Imported here so decks using the native renderer never pay for matplotlib
+    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(figsize=(14, 2.5))
-    fig.patch.set_facecolor(f'#{style_guide["colors"]["content_slide_bg"]}')
-    ax.set_facecolor(f'#{style_guide["colors"]["content_slide_bg"]}')
-    ax.axhline(0, color=f'#{style_guide["colors"]["content_body_text"]}', xmin=0.05, xmax=0.95, zorder=1, linewidth=1.5)
+    fig.patch.set_facecolor(f'#{colors["content_slide_bg"]}')
+    ax.set_facecolor(f'#{colors["content_slide_bg"]}')
+    ax.axhline(0, color=f'#{colors["content_body_text"]}', xmin=0.05, xmax=0.95, zorder=1, linewidth=1.5)
     for i, moment in enumerate(timeline_moments):
-        ax.plot(i + 1, 0, 'o', markersize=20, color=f'#{style_guide["colors"]["content_heading_text"]}', zorder=2)
-        ax.text(x=i + 1, y=-0.3, s=moment.upper(), ha='center', va='top', fontsize=12, fontname='sans-serif', color=f'#{style_guide["colors"]["content_body_text"]}', weight='bold')
+        ax.plot(i + 1, 0, 'o', markersize=20, color=f'#{colors["content_heading_text"]}', zorder=2)
+        ax.text(x=i + 1, y=-0.3, s=moment.upper(), ha='center', va='top', fontsize=12, fontname='sans-serif', color=f'#{colors["content_body_text"]}', weight='bold')
     ax.set_ylim(-1, 1); ax.axis('off'); plt.tight_layout(pad=0.1)
-    plot_stream = BytesIO(); plt.savefig(plot_stream, format='png', facecolor=fig.get_facecolor(), transparent=False); plt.close(fig); plot_stream.seek(0)
-    slide.shapes.add_picture(plot_stream, Inches(1), Inches(3.5), width=Inches(14))
+    plot_stream = BytesIO(); plt.savefig(plot_stream, format='png', facecolor=fig.get_facecolor(), transparent=False); plt.close(fig)
+    png = plot_stream.getvalue()
+    cache.set(key, png)
+    return png
 
 def apply_table_style_pptx(table, style_guide):
     """
@@ -129,7 +462,151 @@ def apply_table_style_pptx(table, style_guide):
             p.font.size = body_fs
             p.font.color.rgb = body_text
 
-def add_df_to_slide(prs, df, slide_title, style_guide):
+def build_table_xml_styles(style_guide):
+    """
+    Pre-renders the paragraph (pPr) and cell (tcPr) XML for header, body and category cells.
+    The fast table writer stamps these shared fragments onto every cell instead of going
+    through python-pptx's per-cell fill/font setters; the resulting XML is the same.
+    """
+    colors, fonts, sizes = style_guide["colors"], style_guide["fonts"], style_guide["font_sizes"]
+
+    def ppr(font, size, color, bold=False, centered=False):
+        algn = ' algn="ctr"' if centered else ''
+        b = ' b="1"' if bold else ''
+        return (f'<a:pPr{algn}><a:defRPr sz="{int(round(size.pt * 100))}"{b}><a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+                f'<a:latin typeface="{escape(font, {chr(34): "&quot;"})}"/></a:defRPr></a:pPr>')
+
+    def tcpr(fill, middle=False):
+        anchor = ' anchor="ctr"' if middle else ''
+        return f'<a:tcPr{anchor}><a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr>'
+
+    return {
+        "header": (ppr(fonts["heading"], sizes["table_header"], colors["table_header_text"], centered=True), tcpr(colors["table_header_bg"])),
+        "body": (ppr(fonts["body"], sizes["table_body"], colors["content_body_text"]), tcpr(colors["table_alt_row_bg"])),
+        "category": (ppr(fonts["body"], Pt(14), colors["content_body_text"], bold=True, centered=True), tcpr(colors["table_alt_row_bg"], middle=True)),
+    }
+
+def _table_cell_xml(text, ppr, tcpr, span_attr=""):
+    paragraphs = "".join(
+        f'<a:p>{ppr}<a:r><a:t>{escape(line)}</a:t></a:r></a:p>' if line else f'<a:p>{ppr}</a:p>'
+        for line in text.split("\n")
+    )
+    return f'<a:tc{span_attr}><a:txBody><a:bodyPr/><a:lstStyle/>{paragraphs}</a:txBody>{tcpr}</a:tc>'
+
+def write_table_fast(table, df, style_guide, row_height=None, header_height=None):
+    """
+    Fills and styles a table created with len(df) + 1 rows in one pass: values are converted
+    to strings in bulk, every row is rendered from the shared style fragments, and the rows
+    are parsed into the table with a single XML parse. Category groups (blank 'Category'
+    cells below a label) are merged via rowSpan/vMerge, as add_df_to_slide does.
+    Row heights default to those the table was created with.
+    """
+    styles = build_table_xml_styles(style_guide)
+    # str() of every value, as the cell-by-cell writer does (DataFrame.astype(str) keeps NaN as missing)
+    texts = df.to_numpy(dtype=object).astype(str)
+    rows, cols = texts.shape
+
+    has_category = 'Category' in df.columns
+    spans = [""] * rows
+    if has_category and rows:
+        group_ids = (df['Category'] != '').cumsum().to_numpy()
+        run_starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]])
+        run_lengths = np.diff(np.r_[run_starts, rows])
+        for start, length in zip(run_starts, run_lengths):
+            if length > 1:
+                spans[start] = f' rowSpan="{length}"'
+                for r in range(start + 1, start + length): spans[r] = ' vMerge="1"'
+
+    tbl = table._tbl
+    existing_rows = tbl.tr_lst
+    row_heights = [tr.get("h") for tr in existing_rows]
+    if header_height is not None: row_heights[0] = int(header_height)
+    if row_height is not None: row_heights[1:] = [int(row_height)] * rows
+    for tr in existing_rows: tbl.remove(tr)
+
+    header_ppr, header_tcpr = styles["header"]
+    body_ppr, body_tcpr = styles["body"]
+    category_ppr, category_tcpr = styles["category"]
+    header_labels = [""] + [str(c) for c in df.columns[1:]]
+    xml_rows = [f'<a:tr h="{row_heights[0]}">' + "".join(_table_cell_xml(label, header_ppr, header_tcpr) for label in header_labels) + '</a:tr>']
+    for r in range(rows):
+        row_texts = texts[r]
+        if has_category and row_texts[0]:
+            first_cell = _table_cell_xml(row_texts[0], category_ppr, category_tcpr, spans[r])
+        else:
+            first_cell = _table_cell_xml(row_texts[0], body_ppr, body_tcpr, spans[r])
+        xml_rows.append(f'<a:tr h="{row_heights[r + 1]}">' + first_cell + "".join(_table_cell_xml(t, body_ppr, body_tcpr) for t in row_texts[1:]) + '</a:tr>')
+
+    fragment = parse_xml(f'<a:tbl {nsdecls("a")}>{"".join(xml_rows)}</a:tbl>')
+    tbl.extend(list(fragment))
+
+def compute_table_layout(prs, style_guide, max_rows_per_slide=None):
+    """
+    Works out how many scorecard rows fit on one table slide for this deck and style.
+    Computed once per deck in create_presentation and shared by every table slide.
+    """
+    sizes = style_guide["font_sizes"]
+    # One line of text at ~1.2x line spacing plus the default top/bottom cell margins.
+    # Body rows are sized for the 14pt category label so merged labels never overflow.
+    body_row_height = int(Pt(max(sizes["table_body"].pt, 14) * 1.2) + 2 * TABLE_CELL_MARGIN)
+    header_row_height = int(Pt(sizes["table_header"].pt * 1.2) + 2 * TABLE_CELL_MARGIN)
+    available = prs.slide_height - TABLE_TOP - TABLE_BOTTOM_MARGIN - header_row_height
+    rows_per_slide = max(1, int(available // body_row_height))
+    if max_rows_per_slide:
+        rows_per_slide = min(rows_per_slide, max_rows_per_slide)
+    return {"rows_per_slide": rows_per_slide, "row_height": body_row_height, "header_height": header_row_height}
+
+def paginate_scorecard(df, rows_per_slide):
+    """
+    Splits a scorecard into pages of at most rows_per_slide rows. A page ends early at a
+    category boundary when the next group would fit on one page; a group that still has to
+    be split gets its Category label repeated on the continuation page.
+    """
+    if len(df) <= rows_per_slide:
+        return [df]
+    df = df.reset_index(drop=True)
+    n = len(df)
+    if 'Category' not in df.columns:
+        return [df.iloc[i:i + rows_per_slide].reset_index(drop=True) for i in range(0, n, rows_per_slide)]
+
+    is_label = (df['Category'] != '').to_numpy()
+    positions = np.arange(n)
+    group_start = np.maximum.accumulate(np.where(is_label, positions, 0))
+    label_starts = np.r_[np.flatnonzero(is_label), n]
+    group_end = label_starts[np.searchsorted(label_starts, positions, side='right')]
+    labels = df['Category'].where(is_label).ffill().fillna('')
+    category_col = df.columns.get_loc('Category')
+
+    pages, start = [], 0
+    while start < n:
+        end = min(start + rows_per_slide, n)
+        if end < n and not is_label[end]:
+            split_group = group_start[end]
+            if split_group > start and group_end[end] - split_group <= rows_per_slide:
+                end = split_group
+        page = df.iloc[start:end].reset_index(drop=True)
+        if not is_label[start] and labels.iat[start]:
+            page.iat[0, category_col] = labels.iat[start]
+        pages.append(page)
+        start = end
+    return pages
+
+def add_df_to_slide(prs, df, slide_title, style_guide, fast_table=True, layout=None):
+    """
+    Adds the DataFrame as a styled table, continuing onto extra slides (with a repeated
+    header) when it exceeds the layout's row budget. fast_table=False uses the original
+    cell-by-cell writer.
+    """
+    layout = layout or compute_table_layout(prs, style_guide)
+    # Typed scorecards are formatted here, at render time
+    df = format_scorecard_for_display(df)
+    pages = paginate_scorecard(df, layout["rows_per_slide"])
+    for page_number, page_df in enumerate(pages, start=1):
+        page_title = slide_title if len(pages) == 1 else f"{slide_title} ({page_number}/{len(pages)})"
+        add_table_slide(prs, page_df, page_title, style_guide, layout, fast_table=fast_table)
+
+@tracing.traced("slide.table")
+def add_table_slide(prs, df, slide_title, style_guide, layout, fast_table=True):
     slide = prs.slides.add_slide(prs.slide_layouts[5])
     slide.background.fill.solid(); slide.background.fill.fore_color.rgb = style_guide["colors"]["content_slide_bg"]
     
@@ -137,9 +614,16 @@ def add_df_to_slide(prs, df, slide_title, style_guide):
     p = title_shape.text_frame.paragraphs[0]; p.text = slide_title; p.font.name = style_guide['fonts']['heading']; p.font.size = style_guide['font_sizes']['content_title']; p.font.color.rgb = style_guide['colors'].get("content_heading_text")
 
     rows, cols = df.shape
-    table = slide.shapes.add_table(rows + 1, cols, Inches(0.5), Inches(1.2), Inches(15), Inches(1.0)).table
+    table_height = layout["header_height"] + rows * layout["row_height"]
+    table = slide.shapes.add_table(rows + 1, cols, TABLE_LEFT, TABLE_TOP, TABLE_WIDTH, table_height).table
     table.columns[0].width = Inches(2.0); table.columns[1].width = Inches(4.5)
     for i in range(2, cols): table.columns[i].width = Inches(2.0)
+    if fast_table:
+        write_table_fast(table, df, style_guide, row_height=layout["row_height"], header_height=layout["header_height"])
+        return
+
+    table.rows[0].height = layout["header_height"]
+    for r in range(1, rows + 1): table.rows[r].height = layout["row_height"]
 
     table.cell(0, 0).text = ""
     for i, col_name in enumerate(df.columns[1:], start=1): table.cell(0, i).text = col_name
@@ -0,0 +1,92 @@
+import pandas as pd
+from typing import Iterator, Optional
+
+# ================================================================================
+# Typed Scorecard Schema
+# ================================================================================
+# Scorecard rows are kept typed end to end: Category is categorical, values are
+# floats and '% Difference' is a numeric ratio (0.125 == 12.5%). Formatting into
+# strings happens only at render time (format_scorecard_for_display), so reruns
+# and exports no longer reparse strings.
+SCORECARD_COLUMNS = ["Category", "Metric", "Actuals", "Benchmark", "% Difference"]
+# '' is a real category: it marks the rows below a group's label (the "clean look")
+CATEGORY_DTYPE = pd.CategoricalDtype(["Reach", "Depth", "Action", "Uncategorized", ""])
+VALUE_DTYPE = "float64"
+PERCENT_DIFFERENCE_FORMAT = "{:.1%}"
+
+
+def _to_float(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_float_dtype(series):
+        return series.astype(VALUE_DTYPE, copy=False)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(VALUE_DTYPE)
+    # Legacy frames stored '% Difference' as formatted text such as '12.5%'
+    text = series.astype("string").str.strip()
+    is_percent = text.str.endswith("%").fillna(False)
+    values = pd.to_numeric(text.str.rstrip("%"), errors="coerce").astype(VALUE_DTYPE)
+    return values.where(~is_percent, values / 100)
+
+
+def to_typed_scorecard(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the scorecard with the compact typed schema. Columns that already have the
+    right dtype are passed through untouched, so calling this on every rerun is cheap.
+    """
+    df = df.copy()
+    if "Category" in df.columns and not isinstance(df["Category"].dtype, pd.CategoricalDtype):
+        category = df["Category"].astype("string").fillna("")
+        unknown = ~category.isin(CATEGORY_DTYPE.categories)
+        df["Category"] = category.where(~unknown, "Uncategorized").astype(CATEGORY_DTYPE)
+    for column in ("Actuals", "Benchmark", "% Difference"):
+        if column in df.columns:
+            df[column] = _to_float(df[column])
+    return df
+
+
+def percent_difference(actuals: pd.Series, benchmark: pd.Series) -> pd.Series:
+    """(Actuals - Benchmark) / Benchmark as a float ratio; NaN where there is no usable benchmark."""
+    benchmark = benchmark.where(benchmark != 0)
+    return (actuals - benchmark) / benchmark
+
+
+def format_scorecard_for_display(df: pd.DataFrame) -> pd.DataFrame:
+    """Render-time view of a typed scorecard: '% Difference' as '12.5%' text and blank categories as ''."""
+    display = df.copy()
+    if "% Difference" in display.columns and pd.api.types.is_numeric_dtype(display["% Difference"]):
+        display["% Difference"] = pd.Series(
+            [PERCENT_DIFFERENCE_FORMAT.format(v) if pd.notna(v) else None for v in display["% Difference"]],
+            index=display.index, dtype=object
+        )
+    if "Category" in display.columns and isinstance(display["Category"].dtype, pd.CategoricalDtype):
+        display["Category"] = display["Category"].astype(object).where(display["Category"].notna(), "")
+    return display
+
+
+class ScorecardRow:
+    """One scorecard row for code that doesn't want a DataFrame (exports, APIs)."""
+    __slots__ = ("category", "metric", "actuals", "benchmark", "percent_difference")
+
+    def __init__(self, category: str, metric: str, actuals: Optional[float], benchmark: Optional[float], percent_difference: Optional[float]):
+        self.category = category
+        self.metric = metric
+        self.actuals = actuals
+        self.benchmark = benchmark
+        self.percent_difference = percent_difference
+
+    def __repr__(self):
+        return (f"ScorecardRow(category={self.category!r}, metric={self.metric!r}, actuals={self.actuals!r}, "
+                f"benchmark={self.benchmark!r}, percent_difference={self.percent_difference!r})")
+
+
+def iter_scorecard_rows(df: pd.DataFrame, fill_categories: bool = True) -> Iterator[ScorecardRow]:
+    """
+    Yields ScorecardRow objects from a typed scorecard. With fill_categories, rows under a
+    group label get the group's category instead of ''. Missing numbers become None.
+    """
+    typed = to_typed_scorecard(df)
+    categories = typed["Category"].astype(object).where(typed["Category"].notna(), "")
+    if fill_categories:
+        categories = categories.where(categories != "").ffill().fillna("")
+    numbers = typed[["Actuals", "Benchmark", "% Difference"]].astype(object).where(typed[["Actuals", "Benchmark", "% Difference"]].notna(), None)
+    for category, metric, (actuals, benchmark, pct) in zip(categories, typed["Metric"], numbers.itertuples(index=False, name=None)):
+        yield ScorecardRow(category, metric, actuals, benchmark, pct)
@@ -1,6 +1,315 @@
 # strategy.py
+import json
+import os
+import string
+from typing import Dict, List, Optional, Tuple
 
-def generate_strategy(objective, investment, metrics, ai_categories, influencer_data, owned_channel_data):
+import numpy as np
+import pandas as pd
+
+import feedback
+from categorization import normalize_metric_name
+
+# ================================================================================
+# Influencer Model
+# ================================================================================
+# Rosters are held as one typed DataFrame (name, follower_count, engagement_rate in %)
+# so every figure below is computed in a single vectorized pass, even for agency
+# rosters with tens of thousands of influencers. Results are plain numbers;
+# format_calculated_outputs turns them into display strings.
+INFLUENCER_COLUMNS = ["name", "follower_count", "engagement_rate"]
+# Follower-count tiers: [lower bound, next bound)
+INFLUENCER_TIERS = ["nano", "micro", "macro"]
+INFLUENCER_TIER_BOUNDS = [0, 10_000, 100_000, np.inf]
+ENGAGEMENT_PERCENTILES = (25, 50, 75, 90)
+# Size of the audience pool the roster draws from. Overlap-adjusted reach assumes each
+# influencer's followers are an independent sample of this pool; set it per campaign/region.
+DEFAULT_ADDRESSABLE_AUDIENCE = 50_000_000
+
+
+def to_influencer_frame(influencer_data) -> pd.DataFrame:
+    """Typed roster from a list of dicts (the Step 2 form) or a DataFrame; missing numbers become 0."""
+    df = influencer_data if isinstance(influencer_data, pd.DataFrame) else pd.DataFrame(list(influencer_data or []))
+    df = df.reindex(columns=INFLUENCER_COLUMNS).reset_index(drop=True)
+    return pd.DataFrame({
+        "name": df["name"].astype("string").fillna(""),
+        "follower_count": pd.to_numeric(df["follower_count"], errors="coerce").fillna(0).clip(lower=0).astype("int64"),
+        "engagement_rate": pd.to_numeric(df["engagement_rate"], errors="coerce").fillna(0.0).clip(0.0, 100.0).astype("float64"),
+    })
+
+
+def influencer_model(influencer_data, addressable_audience: float = DEFAULT_ADDRESSABLE_AUDIENCE) -> dict:
+    """
+    Computes the roster's numbers in one pass:
+    totals (reach, engaged audience), engagement-weighted rate, engagement-rate percentiles,
+    overlap-adjusted (unique) reach and a per-tier breakdown DataFrame (nano/micro/macro).
+    """
+    roster = to_influencer_frame(influencer_data)
+    followers = roster["follower_count"].to_numpy(dtype="float64")
+    rates = roster["engagement_rate"].to_numpy(dtype="float64")
+    engaged = followers * rates / 100.0
+
+    total_reach = followers.sum()
+    total_engaged = engaged.sum()
+    # P(a member of the pool is reached by nobody) = prod(1 - f_i / N); log1p keeps it stable for large rosters
+    if addressable_audience and len(followers):
+        share = np.minimum(followers / addressable_audience, 1.0)
+        with np.errstate(divide="ignore"):
+            unreached_log = np.log1p(-share).sum()
+        overlap_adjusted_reach = float(-np.expm1(unreached_log) * addressable_audience)
+    else:
+        overlap_adjusted_reach = float(total_reach)
+
+    tier = pd.cut(followers, bins=INFLUENCER_TIER_BOUNDS, labels=INFLUENCER_TIERS, right=False)
+    tiers = pd.DataFrame({"tier": tier, "followers": followers, "engaged": engaged, "rate": rates}).groupby("tier", observed=False).agg(
+        influencers=("followers", "size"), reach=("followers", "sum"), engaged_audience=("engaged", "sum"), median_engagement_rate=("rate", "median")
+    )
+    tiers["share_of_reach"] = tiers["reach"] / total_reach if total_reach else 0.0
+
+    percentiles = np.percentile(rates, ENGAGEMENT_PERCENTILES) if len(rates) else [np.nan] * len(ENGAGEMENT_PERCENTILES)
+    return {
+        "influencer_count": len(roster),
+        "total_reach": float(total_reach),
+        "total_engaged_audience": float(total_engaged),
+        "overlap_adjusted_reach": overlap_adjusted_reach,
+        "weighted_engagement_rate": float(total_engaged / total_reach * 100.0) if total_reach else 0.0,
+        "engagement_percentiles": {f"p{q}": float(v) for q, v in zip(ENGAGEMENT_PERCENTILES, percentiles)},
+        "tiers": tiers,
+    }
+
+
+# Display format per calculated output; anything not listed is a whole number with separators
+OUTPUT_FORMATS = {
+    "Investment Weighting Factor": "{}x",
+    "Weighted Influencer Engagement Rate": "{:.2f}%",
+    "Owned Channel Avg. Engagement": "{}%",
+}
+
+
+def format_calculated_outputs(outputs: dict) -> dict:
+    """Display strings for generate_strategy's numeric calculated_outputs (used at render time only)."""
+    return {label: OUTPUT_FORMATS.get(label, "{:,.0f}").format(value) for label, value in outputs.items()}
+
+
+# ================================================================================
+# Strategy Rules
+# ================================================================================
+# Investment weights, objective priorities and strategic considerations are data,
+# not code: DEFAULT_STRATEGY_RULES below, optionally extended by a JSON file named
+# in SCORECARD_STRATEGY_RULES (same shape; weights and priorities are merged key by
+# key, considerations replace a default with the same "id" or are appended, and
+# "enabled": false switches one off). The rules are compiled once at import into
+# hash lookups, and StrategyRules.evaluate checks all of them in one pass over the
+# selected metrics.
+#
+# A consideration fires when every condition in its "when" holds:
+#   objective / investment: the profile's value is one of the listed values
+#   any_metric:   at least one selected metric is listed (case/whitespace-insensitive)
+#   any_category: at least one selected metric has one of these categories
+#   no_category:  no selected metric has any of these categories
+# Its text may use {metrics} (the matched any_metric metrics), {objective} and {investment}.
+STRATEGY_RULES_ENV = "SCORECARD_STRATEGY_RULES"
+RULE_CONDITIONS = ("objective", "investment", "any_metric", "any_category", "no_category")
+RULE_TEXT_FIELDS = ("metrics", "objective", "investment")
+
+DEFAULT_STRATEGY_RULES = {
+    "investment_weights": {
+        "Low (<$50k)": 1.0,
+        "Medium ($50k - $250k)": 1.25,
+        "High ($250k - $1M)": 1.6,
+        "Major (>$1M)": 2.0,
+    },
+    "default_investment_weight": 1.0,
+    "priorities": {
+        "Brand Awareness / Reach":      {"Reach": "High", "Depth": "Medium", "Action": "Low"},
+        "Audience Engagement / Depth":  {"Depth": "High", "Reach": "Medium", "Action": "Low"},
+        "Conversion / Action":          {"Action": "High", "Depth": "Medium", "Reach": "Low"},
+    },
+    "default_priority": "Medium",
+    "considerations": [
+        {
+            "id": "costly_metrics_low_investment",
+            "type": "Warning",
+            "when": {"investment": ["Low (<$50k)"], "any_metric": ["Press UMV (unique monthly views)", "Social Impressions"]},
+            "text": "With a 'Low' investment, achieving high performance for costly metrics like {metrics} can be challenging. Focus on organic growth and efficiency.",
+        },
+        {
+            "id": "conversion_without_action_metrics",
+            "type": "Warning",
+            "when": {"objective": ["Conversion / Action"], "no_category": ["Action"]},
+            "text": "Your objective is 'Conversion / Action', but no 'Action' metrics are selected. Ensure you add metrics that directly measure your conversion goals (e.g., sign-ups, downloads).",
+        },
+    ],
+}
+
+
+class _Rule:
+    __slots__ = ("rule_id", "type", "text", "objectives", "investments", "metrics", "any_categories", "no_categories")
+
+    def __init__(self, spec: dict):
+        when = spec.get("when") or {}
+        unknown = set(when) - set(RULE_CONDITIONS)
+        if unknown:
+            raise ValueError(f"Strategy rule '{spec.get('id')}' has unknown conditions: {', '.join(sorted(unknown))}.")
+        if not spec.get("text"):
+            raise ValueError(f"Strategy rule '{spec.get('id')}' has no text.")
+        fields = {name for _, name, _, _ in string.Formatter().parse(spec["text"]) if name is not None}
+        if fields - set(RULE_TEXT_FIELDS):
+            raise ValueError(f"Strategy rule '{spec.get('id')}' uses unknown text fields: {', '.join(sorted(fields - set(RULE_TEXT_FIELDS)))}.")
+        self.rule_id = spec.get("id")
+        self.type = spec.get("type", "Warning")
+        self.text = spec["text"]
+        # None means "no condition"; the rest are frozensets for O(1) membership
+        self.objectives = self._values(when, "objective")
+        self.investments = self._values(when, "investment")
+        self.metrics = self._values(when, "any_metric")
+        self.any_categories = self._values(when, "any_category")
+        self.no_categories = self._values(when, "no_category")
+
+    def _values(self, when, key):
+        if key not in when:
+            return None
+        values = when[key]
+        if isinstance(values, str) or not isinstance(values, (list, tuple)):
+            raise ValueError(f"Strategy rule '{self.rule_id or '?'}': '{key}' must be a list.")
+        return frozenset(values)
+
+    def applies_to(self, objective, investment) -> bool:
+        return (self.objectives is None or objective in self.objectives) and (self.investments is None or investment in self.investments)
+
+
+class StrategyRules:
+    """Strategy rules compiled into hash lookups (see DEFAULT_STRATEGY_RULES for the format)."""
+
+    def __init__(self, spec: dict):
+        self.spec = check_strategy_rules(spec)
+        self.investment_weights: Dict[str, float] = {k: float(v) for k, v in spec.get("investment_weights", {}).items()}
+        self.default_investment_weight = float(spec.get("default_investment_weight", 1.0))
+        # objective -> category -> priority
+        self.priorities: Dict[str, Dict[str, str]] = {objective: dict(scheme) for objective, scheme in spec.get("priorities", {}).items()}
+        self.default_priority = spec.get("default_priority", "Medium")
+        self.rules: Tuple[_Rule, ...] = tuple(_Rule(rule) for rule in spec.get("considerations", []) if rule.get("enabled", True))
+        # normalized metric name -> indexes of the rules listing it under any_metric
+        rules_by_metric: Dict[str, set] = {}
+        for index, rule in enumerate(self.rules):
+            for metric in rule.metrics or ():
+                rules_by_metric.setdefault(normalize_metric_name(metric), set()).add(index)
+        self.rules_by_metric: Dict[str, Tuple[int, ...]] = {metric: tuple(sorted(indexes)) for metric, indexes in rules_by_metric.items()}
+
+    def investment_weight(self, investment) -> float:
+        return self.investment_weights.get(investment, self.default_investment_weight)
+
+    def evaluate(self, objective, investment, metrics, categories) -> Tuple[List[dict], List[dict]]:
+        """
+        Prioritizes `metrics` for `objective` and collects the considerations that fire,
+        in one pass over the metrics. Returns (prioritized_metrics, considerations).
+        """
+        scheme = self.priorities.get(objective, {})
+        prioritized, seen_categories, matched = [], set(), {}
+        for metric in metrics:
+            category = categories.get(metric, "Uncategorized")
+            prioritized.append({"Metric": metric, "Category": category, "Priority": scheme.get(category, self.default_priority)})
+            seen_categories.add(category)
+            for index in self.rules_by_metric.get(normalize_metric_name(metric), ()):
+                matched.setdefault(index, []).append(metric)
+
+        considerations = []
+        for index, rule in enumerate(self.rules):
+            if not rule.applies_to(objective, investment):
+                continue
+            if rule.metrics is not None and index not in matched:
+                continue
+            if rule.any_categories is not None and rule.any_categories.isdisjoint(seen_categories):
+                continue
+            if rule.no_categories is not None and not rule.no_categories.isdisjoint(seen_categories):
+                continue
+            text = rule.text.format(metrics=", ".join(matched.get(index, [])), objective=objective, investment=investment)
+            considerations.append({"type": rule.type, "text": text})
+        return prioritized, considerations
+
+
+def check_strategy_rules(spec) -> dict:
+    """Raises ValueError naming the offending key unless every section present in `spec` has the right shape."""
+    def is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    if not isinstance(spec, dict):
+        raise ValueError("Strategy rules must be a JSON object.")
+    weights = spec.get("investment_weights", {})
+    if not isinstance(weights, dict) or not all(is_number(v) for v in weights.values()):
+        raise ValueError("Strategy rules: 'investment_weights' must map investment levels to numbers.")
+    if not is_number(spec.get("default_investment_weight", 1.0)):
+        raise ValueError("Strategy rules: 'default_investment_weight' must be a number.")
+    priorities = spec.get("priorities", {})
+    if not isinstance(priorities, dict) or not all(isinstance(scheme, dict) for scheme in priorities.values()):
+        raise ValueError("Strategy rules: 'priorities' must map each objective to a {category: priority} object.")
+    if not isinstance(spec.get("default_priority", ""), str):
+        raise ValueError("Strategy rules: 'default_priority' must be a string.")
+    considerations = spec.get("considerations", [])
+    if not isinstance(considerations, list):
+        raise ValueError("Strategy rules: 'considerations' must be a list of rule objects.")
+    for i, rule in enumerate(considerations):
+        if not isinstance(rule, dict):
+            raise ValueError(f"Strategy rules: considerations[{i}] must be an object.")
+        if not isinstance(rule.get("id", ""), str):
+            raise ValueError(f"Strategy rules: considerations[{i}] 'id' must be a string.")
+        if not isinstance(rule.get("when", {}), dict):
+            raise ValueError(f"Strategy rule '{rule.get('id', i)}': 'when' must be an object.")
+        if not isinstance(rule.get("text", ""), str):
+            raise ValueError(f"Strategy rule '{rule.get('id', i)}': 'text' must be a string.")
+    return spec
+
+
+def merge_strategy_rules(base: dict, override: dict) -> dict:
+    """Layers a rules config over `base` (weights/priorities by key, considerations by id)."""
+    check_strategy_rules(override)
+    merged = {
+        "investment_weights": {**base.get("investment_weights", {}), **override.get("investment_weights", {})},
+        "default_investment_weight": override.get("default_investment_weight", base.get("default_investment_weight", 1.0)),
+        "priorities": {objective: dict(scheme) for objective, scheme in base.get("priorities", {}).items()},
+        "default_priority": override.get("default_priority", base.get("default_priority", "Medium")),
+    }
+    for objective, scheme in override.get("priorities", {}).items():
+        merged["priorities"].setdefault(objective, {}).update(scheme)
+    considerations = {rule.get("id") or f"rule_{i}": rule for i, rule in enumerate(base.get("considerations", []))}
+    for i, rule in enumerate(override.get("considerations", [])):
+        considerations[rule.get("id") or f"override_rule_{i}"] = rule
+    merged["considerations"] = list(considerations.values())
+    return merged
+
+
+def load_strategy_rules(path: Optional[str] = None) -> StrategyRules:
+    """
+    Compiles DEFAULT_STRATEGY_RULES, layered with the JSON config at `path`
+    (default: the file named in SCORECARD_STRATEGY_RULES, if any).
+    Raises ValueError if the config cannot be read or a rule is malformed.
+    """
+    path = path or os.environ.get(STRATEGY_RULES_ENV)
+    if not path:
+        return StrategyRules(DEFAULT_STRATEGY_RULES)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            override = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read strategy rules from '{path}': {e}") from e
+    try:
+        return StrategyRules(merge_strategy_rules(DEFAULT_STRATEGY_RULES, override))
+    except ValueError as e:
+        raise ValueError(f"Invalid strategy rules in '{path}': {e}") from e
+
+
+try:
+    STRATEGY_RULES = load_strategy_rules()
+except (ValueError, TypeError, AttributeError) as e:
+    # A broken marketing config must not take the app down; fall back to the built-in rules
+    feedback.logger.error("%s Using the built-in strategy rules.", e)
+    STRATEGY_RULES = StrategyRules(DEFAULT_STRATEGY_RULES)
+
+
+# ================================================================================
+# Strategy Profile
+# ================================================================================
+def generate_strategy(objective, investment, metrics, ai_categories, influencer_data, owned_channel_data, rules: Optional[StrategyRules] = None):
     """
     Generates strategic advice and calculated benchmarks based on a detailed
     event profile, including investment, influencers, and owned channels.
@@ -10,80 +319,41 @@ def generate_strategy(objective, investment, metrics, ai_categories, influencer_
         investment (str): The campaign's investment level.
         metrics (list): A list of the user's selected metrics.
         ai_categories (dict): A dictionary mapping metrics to their AI-generated category.
-        influencer_data (list): A list of dictionaries, each containing data for an influencer.
+        influencer_data (list | DataFrame): Influencer rows (name, follower_count, engagement_rate in %).
         owned_channel_data (dict): A dictionary containing data for owned channels.
+        rules (StrategyRules, optional): Compiled rules; defaults to STRATEGY_RULES.
 
     Returns:
-        dict: A dictionary containing prioritized metrics, considerations, and calculated outputs.
+        dict: A dictionary containing prioritized metrics, considerations, numeric calculated
+        outputs (see format_calculated_outputs) and the influencer model (see influencer_model).
     """
 
-    # --- Part 1: Calculate Investment Weighting Factor ---
-    investment_map = {
-        "Low (<$50k)": 1.0,
-        "Medium ($50k - $250k)": 1.25,
-        "High ($250k - $1M)": 1.6,
-        "Major (>$1M)": 2.0
-    }
-    investment_weighting_factor = investment_map.get(investment, 1.0)
-
-    # --- Part 2: Calculate Influencer Metrics ---
-    total_potential_reach = 0
-    total_projected_engaged_audience = 0
-    if influencer_data:
-        for influencer in influencer_data:
-            followers = influencer.get("follower_count", 0)
-            engagement_rate = influencer.get("engagement_rate", 0) / 100.0  # Convert from % to decimal
-            total_potential_reach += followers
-            total_projected_engaged_audience += followers * engagement_rate
-
-    # --- Part 3: Consolidate Calculated Outputs ---
+    rules = rules or STRATEGY_RULES
+
+    # --- Part 1: Investment Weighting Factor (from the rules) ---
+    investment_weighting_factor = rules.investment_weight(investment)
+
+    # --- Part 2: Calculate Influencer Metrics (vectorized, see influencer_model) ---
+    influencers = influencer_model(influencer_data)
+
+    # --- Part 3: Consolidate Calculated Outputs (numbers; formatted at display time) ---
     calculated_outputs = {
-        "Investment Weighting Factor": f"{investment_weighting_factor}x",
-        "Total Potential Influencer Reach": f"{total_potential_reach:,.0f}",
-        "Total Projected Engaged Audience": f"{total_projected_engaged_audience:,.0f}",
-        "Owned Channel Avg. Reach": f"{owned_channel_data.get('avg_reach', 0):,.0f}",
-        "Owned Channel Avg. Engagement": f"{owned_channel_data.get('avg_engagement', 0)}%"
+        "Investment Weighting Factor": investment_weighting_factor,
+        "Total Potential Influencer Reach": influencers["total_reach"],
+        "Overlap-Adjusted Influencer Reach": influencers["overlap_adjusted_reach"],
+        "Total Projected Engaged Audience": influencers["total_engaged_audience"],
+        "Weighted Influencer Engagement Rate": influencers["weighted_engagement_rate"],
+        "Owned Channel Avg. Reach": owned_channel_data.get('avg_reach', 0),
+        "Owned Channel Avg. Engagement": owned_channel_data.get('avg_engagement', 0)
     }
 
-    # --- Part 4: Prioritize Metrics based on Objective (Original Logic) ---
-    prioritized_metrics = []
-    priority_map = {
-        "Brand Awareness / Reach":      {"Reach": "High", "Depth": "Medium", "Action": "Low"},
-        "Audience Engagement / Depth":  {"Depth": "High", "Reach": "Medium", "Action": "Low"},
-        "Conversion / Action":          {"Action": "High", "Depth": "Medium", "Reach": "Low"}
-    }
-    current_priority_scheme = priority_map.get(objective, {})
-
-    for metric in metrics:
-        category = ai_categories.get(metric, "Uncategorized")
-        priority = current_priority_scheme.get(category, "Medium")
-        prioritized_metrics.append({
-            "Metric": metric,
-            "Category": category,
-            "Priority": priority
-        })
-
-    # --- Part 5: Generate Strategic Considerations (Original Logic, can be enhanced later) ---
-    considerations = []
-    high_cost_metrics = ["Press UMV (unique monthly views)", "Social Impressions"]
-
-    if investment == 'Low (<$50k)':
-        costly_metrics_selected = [m for m in metrics if m in high_cost_metrics]
-        if costly_metrics_selected:
-            considerations.append({
-                "type": "Warning",
-                "text": f"With a 'Low' investment, achieving high performance for costly metrics like {', '.join(costly_metrics_selected)} can be challenging. Focus on organic growth and efficiency."
-            })
-
-    if objective == 'Conversion / Action' and not any(p['Category'] == 'Action' for p in prioritized_metrics):
-        considerations.append({
-                "type": "Warning",
-                "text": "Your objective is 'Conversion / Action', but no 'Action' metrics are selected. Ensure you add metrics that directly measure your conversion goals (e.g., sign-ups, downloads)."
-            })
+    # --- Parts 4 & 5: Prioritized Metrics and Strategic Considerations (one rules pass) ---
+    prioritized_metrics, considerations = rules.evaluate(objective, investment, metrics, ai_categories)
 
     # --- Final Return Object ---
     return {
         "calculated_outputs": calculated_outputs,
+        "influencer_model": influencers,
         "prioritized_metrics": prioritized_metrics,
         "strategic_considerations": considerations,
     }
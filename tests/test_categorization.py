@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorization import RuleClassifier
+
+# Metric name -> category the local rules must settle it as (None: left to the API)
+LOCAL_CASES = [
+    ("Social Impressions", "Reach"),
+    ("Email CTR", "Depth"),
+    ("Labs program sign-ups", "Action"),
+    ("DAU", "Action"),
+    ("Video Views", "Reach"),
+    ("Page views", "Reach"),
+    ("Click-through rate", "Depth"),
+    ("Avg. session duration", "Depth"),
+    # Longer phrases must win over the shorter rules they contain
+    ("View-through rate", "Depth"),
+    ("Video view duration", "Depth"),
+    ("Video completion rate", "Depth"),
+    ("Quarterly outlook", None),
+]
+
+
+@pytest.mark.parametrize("metric, expected", LOCAL_CASES)
+def test_local_rules(metric, expected):
+    category, _ = RuleClassifier().classify(metric)
+    assert category == expected
+
+
+def test_service_retries_metrics_left_uncategorized(monkeypatch):
+    import categorization
+
+    calls = []
+    answers = iter([{"A": "Reach"}, {"B": "Depth"}])
+
+    def fake_categories(metrics, api_key):
+        calls.append(list(metrics))
+        return next(answers)
+
+    monkeypatch.setattr(categorization, "get_ai_metric_categories", fake_categories)
+    service = categorization.CategorizationService("key")
+    assert service.categorize(["A", "B"]) == {"A": "Reach"}
+    assert service.missing(["A", "B"]) == ["B"]
+    assert service.categorize(["A", "B"]) == {"A": "Reach", "B": "Depth"}
+    assert calls == [["A", "B"], ["B"]]
@@ -0,0 +1,34 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli import load_jobs
+from data_processing import process_scorecard_data
+
+
+def write_jobs(tmp_path, **job):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": [{"name": "launch", "metrics": ["X"], "moments": {"Pre": {}}, **job}]}))
+    return str(path)
+
+
+def test_categories_are_normalized(tmp_path):
+    jobs = load_jobs(write_jobs(tmp_path, ai_categories={"X": " reach", "Y": "ACTION"}))
+    assert jobs[0]["ai_categories"] == {"X": "Reach", "Y": "Action"}
+
+
+@pytest.mark.parametrize("ai_categories", [{"X": "Awareness"}, {"X": None}, ["Reach"]])
+def test_bad_categories_are_rejected(tmp_path, ai_categories):
+    with pytest.raises(ValueError, match="Job 'launch'"):
+        load_jobs(write_jobs(tmp_path, ai_categories=ai_categories))
+
+
+def test_scorecard_treats_unknown_categories_as_uncategorized():
+    sheets = process_scorecard_data({"metrics": ["X", "Y"], "ai_categories": {"X": "reach", "Y": "Depth"}})
+    df = sheets["Final Scorecard"]
+    assert list(df["Metric"]) == ["Y", "X"]
+    assert list(df["Category"]) == ["Depth", "Uncategorized"]
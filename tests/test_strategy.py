@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from strategy import DEFAULT_STRATEGY_RULES, generate_strategy, load_strategy_rules
+
+MALFORMED_CONFIGS = [
+    {"considerations": ["oops"]},
+    {"considerations": {"x": {"text": "Hi"}}},
+    {"considerations": [{"id": "x", "when": ["Reach"], "text": "Hi"}]},
+    {"considerations": [{"id": "x", "when": {"any_metric": "Reach"}, "text": "Hi"}]},
+    {"considerations": [{"id": "x", "text": "{unknown}"}]},
+    {"considerations": [{"id": ["x"], "text": "Hi"}]},
+    {"priorities": ["Reach"]},
+    {"priorities": {"Conversion / Action": "High"}},
+    {"investment_weights": {"Low (<$50k)": "high"}},
+    ["not", "an", "object"],
+]
+
+
+def write_config(tmp_path, config):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+@pytest.mark.parametrize("config", MALFORMED_CONFIGS)
+def test_malformed_config_raises_value_error(tmp_path, config):
+    with pytest.raises(ValueError, match="rules.json"):
+        load_strategy_rules(write_config(tmp_path, config))
+
+
+@pytest.mark.parametrize("config", MALFORMED_CONFIGS[:3])
+def test_malformed_config_falls_back_on_import(tmp_path, config):
+    env = {**os.environ, "SCORECARD_STRATEGY_RULES": write_config(tmp_path, config)}
+    code = "import strategy; print(len(strategy.STRATEGY_RULES.rules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == str(len(DEFAULT_STRATEGY_RULES["considerations"]))
+
+
+def test_config_adds_and_disables_rules(tmp_path):
+    rules = load_strategy_rules(write_config(tmp_path, {
+        "investment_weights": {"Micro (<$10k)": 0.8},
+        "considerations": [
+            {"id": "conversion_without_action_metrics", "enabled": False},
+            {"id": "reach_needs_depth", "type": "Tip", "text": "Add a Depth metric.",
+             "when": {"objective": ["Brand Awareness / Reach"], "any_category": ["Reach"], "no_category": ["Depth"]}},
+        ],
+    }))
+    assert rules.investment_weight("Micro (<$10k)") == 0.8
+    _, considerations = rules.evaluate("Brand Awareness / Reach", "Micro (<$10k)", ["Reach metric"], {"Reach metric": "Reach"})
+    assert considerations == [{"type": "Tip", "text": "Add a Depth metric."}]
+
+
+def test_default_rules_warn_about_costly_metrics():
+    result = generate_strategy("Conversion / Action", "Low (<$50k)", ["social impressions", "Sign-ups"],
+                               {"Sign-ups": "Action"}, [], {})
+    assert [c["text"][:40] for c in result["strategic_considerations"]] == ["With a 'Low' investment, achieving high "]
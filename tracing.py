@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Optional
+
+# ================================================================================
+# Lightweight Tracing (spans + counters)
+# ================================================================================
+# Spans time the hot paths (API calls, slide builders, benchmark calculation,
+# Excel export); counters tally API calls, cache hits and bytes downloaded.
+# Tracing is off unless SCORECARD_TRACE=1 or enable() is called; while off,
+# span() returns a shared no-op context manager and count() returns at once.
+# The tracer is process-wide, so spans from worker threads (image downloads)
+# land in the same report, as do those of every Streamlit session on the server;
+# the sidebar panel that switches it (ui.render_trace_panel) therefore only
+# appears with SCORECARD_DEBUG_PANEL=1.
+logger = logging.getLogger("scorecard.trace")
+# Oldest spans are dropped past this many, so a long-running app cannot grow without bound
+MAX_SPANS = 20000
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span = ContextVar("current_span", default=None)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "attrs", "span_id", "parent_id", "start", "token")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer, self.name, self.attrs = tracer, name, attrs
+
+    def __enter__(self):
+        self.span_id = self.tracer._next_id()
+        self.parent_id = _current_span.get()
+        self.token = _current_span.set(self.span_id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self.token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._record(self, duration)
+        return False
+
+    def set(self, **attrs):
+        """Adds attributes (e.g. sizes, cache outcome) to the span before it ends."""
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """Collects finished spans and counters; safe to use from several threads."""
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.max_spans = max_spans
+        self.started = time.perf_counter()
+        self.spans = []
+        self.counters = Counter()
+        self._ids = 0
+        self._lock = threading.Lock()
+
+    def _next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def _record(self, span, duration):
+        entry = {
+            "id": span.span_id, "parent": span.parent_id, "name": span.name,
+            "start_s": round(span.start - self.started, 6), "duration_s": round(duration, 6),
+            "thread": threading.current_thread().name, **span.attrs,
+        }
+        with self._lock:
+            self.spans.append(entry)
+            if len(self.spans) > self.max_spans:
+                del self.spans[:len(self.spans) - self.max_spans]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(entry, default=str))
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def stages(self) -> Dict[str, Dict]:
+        """Per-span-name totals: calls, total/max seconds; sorted by total time."""
+        with self._lock:
+            spans = list(self.spans)
+        stages = {}
+        for entry in spans:
+            stage = stages.setdefault(entry["name"], {"calls": 0, "total_s": 0.0, "max_s": 0.0})
+            stage["calls"] += 1
+            stage["total_s"] = round(stage["total_s"] + entry["duration_s"], 6)
+            stage["max_s"] = max(stage["max_s"], entry["duration_s"])
+        return dict(sorted(stages.items(), key=lambda item: item[1]["total_s"], reverse=True))
+
+    def report(self, include_spans: bool = True) -> Dict:
+        with self._lock:
+            report = {"counters": dict(self.counters), "elapsed_s": round(time.perf_counter() - self.started, 6)}
+            spans = list(self.spans)
+        report["stages"] = self.stages()
+        if include_spans:
+            report["spans"] = spans
+        return report
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear(); self.counters.clear()
+            self.started = time.perf_counter()
+
+
+_tracer: Optional[Tracer] = Tracer() if os.environ.get("SCORECARD_TRACE", "").lower() in ("1", "true", "yes") else None
+
+
+def enable() -> Tracer:
+    """Turns tracing on (keeping an existing tracer's data) and returns the tracer."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def disable():
+    global _tracer
+    _tracer = None
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **attrs):
+    """Context manager timing a block as a span named `name`; a no-op while tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return _Span(tracer, name, attrs)
+
+
+def traced(name: str):
+    """Decorator form of span() for whole functions."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value=1):
+    """Adds `value` to a counter such as 'api.calls' or 'cache.images.hits'."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+@contextmanager
+def collect(include_spans: bool = True):
+    """
+    Traces the enclosed block with a fresh tracer and fills the yielded dict with its report
+    when the block ends (the previous tracer, if any, is restored). Handy for one-off runs:
+
+        with tracing.collect() as report:
+            create_presentation(...)
+        tracing.write_report(report, "trace.json")
+    """
+    global _tracer
+    previous, _tracer = _tracer, Tracer()
+    result = {}
+    try:
+        yield result
+    finally:
+        tracer, _tracer = _tracer, previous
+        result.update(tracer.report(include_spans=include_spans))
+
+
+def write_report(report: Dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
@@ -1,6 +1,13 @@
 # ui.py (Original Version)
+import json
+import os
+
 import streamlit as st
-import pandas as pd
+
+import tracing
+
+# The timings panel switches the process-wide tracer, so it is for operators only
+DEBUG_PANEL_ENABLED = os.environ.get("SCORECARD_DEBUG_PANEL", "").lower() in ("1", "true", "yes")
 
 def render_sidebar():
     """
@@ -58,4 +65,35 @@ def render_sidebar():
             
             st.rerun()
 
+        if DEBUG_PANEL_ENABLED:
+            render_trace_panel()
+
     return {}
+
+def render_trace_panel():
+    """
+    Optional debug panel (only with SCORECARD_DEBUG_PANEL=1): records spans/counters (see tracing.py)
+    while switched on and shows where the time went, slowest stage first, with the full JSON report
+    as a download. The tracer is process-wide, so the report covers every session on this server.
+    """
+    with st.expander("🔍 Debug: Timings"):
+        st.caption("⚠️ Timings are recorded for the whole server process: switching this on traces every session, "
+                   "and the report includes their activity, not just yours.")
+        enabled = st.toggle("Record timings", value=tracing.is_enabled())
+        if enabled != tracing.is_enabled():
+            tracing.enable() if enabled else tracing.disable()
+        tracer = tracing.get_tracer()
+        if tracer is None:
+            st.caption("Switch on, then run a step to see per-stage timings.")
+            return
+        report = tracer.report()
+        stages = [{"stage": name, **{k: round(v, 3) if isinstance(v, float) else v for k, v in stage.items()}} for name, stage in report["stages"].items()]
+        if stages:
+            st.dataframe(stages, hide_index=True, use_container_width=True)
+        if report["counters"]:
+            st.json(report["counters"])
+        col1, col2 = st.columns(2)
+        col1.download_button("Report (JSON)", data=json.dumps(report, indent=2, default=str), file_name="scorecard_trace.json", use_container_width=True)
+        if col2.button("Clear", use_container_width=True):
+            tracer.reset()
+            st.rerun()